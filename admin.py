@@ -0,0 +1,90 @@
+import hmac
+import os
+import time
+import streamlit as st
+from backend.usage import USAGE_DIMENSIONS, aggregate_usage, read_usage_log
+
+
+st.set_page_config(page_title="Symphonic - Usage", page_icon="📊", layout="wide")
+
+# Where the apps append one line per upstream Gemini call (see [usage] in secrets)
+USAGE_LOG = st.secrets.get("usage", {}).get("log_path", ".cache/usage.jsonl")
+
+# Time windows offered in the sidebar, in seconds (None: the whole log)
+WINDOWS = {"Last hour": 3600, "Last 24 hours": 86400, "Last 7 days": 7 * 86400, "All time": None}
+
+
+# Optional password gate: set [admin] password in secrets to require it
+def check_password():
+    password = st.secrets.get("admin", {}).get("password", "")
+    if not password or st.session_state.get("admin_authenticated"):
+        return True
+    entered = st.text_input("Admin password", type="password")
+    if entered and hmac.compare_digest(entered, password):
+        st.session_state["admin_authenticated"] = True
+        return True
+    if entered:
+        st.error("Incorrect password.")
+    return False
+
+
+# Re-read the log only when it changes; the modification time is part of the cache key
+@st.cache_data(max_entries=4)
+def load_usage(path, mtime, since):
+    return read_usage_log(path, since)
+
+
+if not check_password():
+    st.stop()
+
+st.title("📊 Gemini Token Usage")
+
+window = st.sidebar.selectbox("Time window", list(WINDOWS), index=1)
+group_by = st.sidebar.multiselect("Group by", list(USAGE_DIMENSIONS) + ["model"], default=["page"])
+
+if not os.path.exists(USAGE_LOG):
+    st.info(f"No usage recorded yet. Upstream Gemini calls are logged to `{USAGE_LOG}`.")
+    st.stop()
+
+seconds = WINDOWS[window]
+# Round the cutoff to the minute so reruns within a minute share the cached read
+since = (time.time() - seconds) // 60 * 60 if seconds else None
+entries = load_usage(USAGE_LOG, os.path.getmtime(USAGE_LOG), since)
+if not entries:
+    st.info(f"No upstream Gemini calls in the selected window ({window.lower()}).")
+    st.stop()
+
+# Headline numbers over the whole window
+overall = aggregate_usage(entries, by=())[0]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Requests", f"{overall['requests']:,}")
+col2.metric("Total tokens", f"{overall['total_tokens']:,}")
+col3.metric("Output tokens / request", f"{overall['avg_output_tokens']:.0f}")
+col4.metric("Output tokens / second", f"{overall['output_tokens_per_second']:.1f}")
+
+# Token spend per feature; finish reasons are shown below instead of as a column
+st.subheader("Token spend")
+rows = aggregate_usage(entries, by=tuple(group_by))
+st.dataframe(
+    [{key: value for key, value in row.items() if key != "finish_reasons"} for row in rows],
+    hide_index=True,
+    column_config={
+        "avg_prompt_tokens": st.column_config.NumberColumn(format="%.0f"),
+        "avg_output_tokens": st.column_config.NumberColumn(format="%.0f"),
+        "output_tokens_per_second": st.column_config.NumberColumn(format="%.1f"),
+        "seconds": st.column_config.NumberColumn(format="%.1f"),
+    },
+)
+if group_by:
+    st.bar_chart({" / ".join(str(row[key]) or "-" for key in group_by): row["total_tokens"] for row in rows})
+
+# Truncated answers (MAX_TOKENS) or blocked ones (SAFETY) point at prompts worth revisiting
+st.subheader("Finish reasons")
+st.dataframe(
+    [{"finish_reason": reason, "requests": count} for reason, count in sorted(overall["finish_reasons"].items())],
+    hide_index=True,
+)
+st.caption(
+    f"{len(entries):,} upstream calls from `{USAGE_LOG}`. Cache hits and coalesced requests "
+    "never reach Gemini and are not counted."
+)
@@ -1,9 +1,12 @@
+import time
 import streamlit as st
-from backend.gemini_api import query_gemini
+from backend.admission import queue_notice
+from backend.gemini_api import stream_gemini
 from backend.langchain import generate_prompt
-from gtts import gTTS
-import re
-from io import BytesIO
+from backend.metrics import registry, start_exporters
+from backend.normalize import canonicalize_query, log_query
+from backend.audio import SpeechPipeline
+from backend.tts import LANGUAGE_CODES
 
 # App Configuration
 st.set_page_config(
@@ -21,12 +24,8 @@ def load_css(file_name):
 # Load the CSS file
 load_css("Ui/Style.css")
 
-# Remove special characters and improve formatting
-def clean_text(text):
-    # Retain alphabetic characters (both English and Hindi), numbers, punctuation, and spaces
-    clean_text = re.sub(r'[^a-zA-Z0-9.,!?;:()\'\" \n\u0900-\u097F]', '', text)
-    return re.sub(r'\s+', ' ', clean_text).strip()
-
+# Serve per-stage latency metrics if [metrics] is configured (once per process)
+start_exporters("symphonic")
 
 # Header Section
 st.markdown(
@@ -94,13 +93,18 @@ tone = st.selectbox(
 
 # User Input Query
 st.markdown("### 🔍 **Enter Your Query**")
-query = st.text_input("💡 Type your topic, theme, or idea (e.g., 'love', 'nature')")
+raw_query = st.text_input("💡 Type your topic, theme, or idea (e.g., 'love', 'nature')")
+# Canonical form ("Love!" -> "love") so trivially different inputs share one prompt and cache entry
+query = canonicalize_query(raw_query)
 
 
 # Generate Response Button
 if st.button("🎤 **Generate Response**"):
     st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
     if query:
+        log_query("symphonic", raw_query, query)
+        request_start = time.perf_counter()
+        render_seconds = 0.0
         with st.spinner("🎶 Composing your literary masterpiece..."):
             # Generate the prompt
             prompt = generate_prompt(
@@ -109,33 +113,53 @@ if st.button("🎤 **Generate Response**"):
                 mode=mode.split()[0].lower(),  # Extracting plain text mode
                 tone=tone.split()[0].lower()  # Extracting plain text tone
             )
-            # Query the Gemini API
-            response = query_gemini(
-                context=f"You are a literature and poetry expert, responding in {language}.", 
-                prompt=prompt
-            )
 
-        # Display the Response
-        if response:
+            # Stream the Gemini response so text renders as soon as the first chunk arrives,
+            # and voice each finished sentence while later ones are still being generated
             st.success("### 🎶 **Your Symphonic Creation**:")
             st.markdown(f"**{mode} in {language} ({tone}):**")
-            st.write(response)
-
-            # Clean the response text
-            clean_response = clean_text(response)
-
-            # Check if the cleaned response is valid (non-empty and not just whitespace)
-            if clean_response and clean_response.strip():
-                try:
-                    # Proceed with text-to-speech if the cleaned response is valid
-                    tts = gTTS(clean_response, lang='en', tld='co.in')
-                    audio_file = BytesIO()
-                    tts.write_to_fp(audio_file)
-                    st.audio(audio_file, format='audio/mp3')
-                except Exception as e:
-                    st.error(f"⚠️ Error generating audio: {e}")
-            else:
+            # Shows the user's place in line when the Gemini queue is full
+            queue_status = st.empty()
+            text_placeholder = st.empty()
+            audio_container = st.container()
+            # Speak in the selected language; the TTS engine is chosen per language
+            speech = SpeechPipeline(lang=LANGUAGE_CODES.get(language, 'en'))
+            response = ""
+            for chunk in stream_gemini(
+                context=f"You are a literature and poetry expert, responding in {language}.", 
+                prompt=prompt,
+                on_queue=queue_notice(queue_status),
+                tags={
+                    "page": "symphonic",
+                    "mode": mode.split()[0].lower(),
+                    "tone": tone.split()[0].lower(),
+                    "language": language.lower(),
+                },
+            ):
+                response += chunk
+                render_start = time.perf_counter()
+                text_placeholder.markdown(response)
+                render_seconds += time.perf_counter() - render_start
+                speech.feed(chunk)
+                for audio in speech.ready():
+                    audio_container.audio(audio, format=speech.mime)
+
+            # Voice the rest of the Response
+            if response:
+                speech.close()
+                for audio in speech.drain():
+                    audio_container.audio(audio, format=speech.mime)
+
+        # Time spent updating the streamed text, and the whole request end to end
+        registry.observe("ui.render", render_seconds, page="symphonic")
+        registry.observe("request", time.perf_counter() - request_start, page="symphonic")
+
+        if response:
+            # Check that there was valid text to convert to speech
+            if not speech.segments:
                 st.error("⚠️ No valid text to convert to speech.")
+            elif speech.errors:
+                st.error(f"⚠️ Error generating audio: {speech.errors[0]}")
         else:
             st.error("⚠️ No response received. Please try again later.")
     else:
@@ -0,0 +1,274 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class AdmissionRejectedError(Exception):
+    """A request was not admitted: the session is over its quota or the queue wait ran out."""
+
+
+class Ticket:
+    """
+    A granted slot; release it when the upstream call ends (or use it as a context manager).
+    Releasing twice is harmless.
+    """
+
+    __slots__ = ("_controller", "_released")
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class _Waiter:
+    __slots__ = ("session_id", "granted", "wake")
+
+    def __init__(self, session_id, wake=None):
+        self.session_id = session_id
+        self.granted = False
+        self.wake = wake  # Called under the lock once granted (async waiters)
+
+
+class AdmissionController:
+    """
+    Process-wide cap on concurrent upstream calls with a fair queue across sessions.
+
+    At most `max_in_flight` calls run at once. Callers beyond that wait in per-session
+    FIFO queues that are served round-robin, so one busy session cannot starve the
+    others. Each session may also start at most `session_requests_per_minute` calls
+    in any sliding minute (0 disables the quota).
+
+    Args:
+        max_in_flight (int): Maximum concurrent upstream calls.
+        session_requests_per_minute (int, optional): Per-session quota; 0 for none.
+        max_wait (float, optional): Longest time a caller waits in the queue, in seconds.
+    """
+
+    def __init__(self, max_in_flight=8, session_requests_per_minute=0, max_wait=60.0):
+        self.max_in_flight = max_in_flight
+        self.session_requests_per_minute = session_requests_per_minute
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._queues = OrderedDict()  # session id -> deque of waiters; key order is the rotation
+        self._history = {}  # session id -> admission times within the last minute
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+
+    def _record(self, session_id, now):
+        self._history.setdefault(session_id, deque()).append(now)
+        self._admitted += 1
+
+    def _over_quota(self, session_id, now):
+        if not self.session_requests_per_minute:
+            return False
+        history = self._history.get(session_id)
+        if history:
+            while history and now - history[0] >= 60:
+                history.popleft()
+            if not history:
+                del self._history[session_id]
+        waiting = len(self._queues.get(session_id, ()))
+        return len(history or ()) + waiting >= self.session_requests_per_minute
+
+    def _dispatch(self):
+        # Grant free slots to the head waiter of each session in turn
+        now = time.monotonic()
+        while self._in_flight < self.max_in_flight and self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            waiter.granted = True
+            self._in_flight += 1
+            self._record(session_id, now)
+            if waiter.wake is not None:
+                waiter.wake()
+        self._cond.notify_all()
+
+    def _position(self, waiter):
+        # 1-based place in line under round-robin: earlier rounds of every session, then
+        # this round's sessions ahead in the rotation
+        sessions = list(self._queues.items())
+        index = next(i for i, (session_id, _) in enumerate(sessions) if session_id == waiter.session_id)
+        rank = self._queues[waiter.session_id].index(waiter)
+        ahead = rank
+        for i, (_, queue) in enumerate(sessions):
+            if i != index:
+                ahead += min(len(queue), rank + 1 if i < index else rank)
+        return ahead + 1
+
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _withdraw(self, waiter):
+        # Give up a waiter's place, or its slot if it was granted meanwhile (lock held)
+        if waiter.granted:
+            self._in_flight -= 1
+        else:
+            queue = self._queues[waiter.session_id]
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.session_id]
+        self._dispatch()
+
+    def _enter(self, waiter, now):
+        # Admit at once if a slot is free, else join the session's queue (lock held).
+        # Returns True when admitted without waiting
+        if self._over_quota(waiter.session_id, now):
+            self._rejected += 1
+            raise AdmissionRejectedError(
+                f"Request quota reached ({self.session_requests_per_minute} per minute); please wait a moment."
+            )
+        if self._in_flight < self.max_in_flight and not self._queues:
+            self._in_flight += 1
+            self._record(waiter.session_id, now)
+            return True
+        self._queues.setdefault(waiter.session_id, deque()).append(waiter)
+        self._queued += 1
+        return False
+
+    def acquire(self, session_id, on_wait=None):
+        """
+        Wait for a slot for one upstream call.
+
+        Args:
+            session_id (str): Caller's session, for fairness and quotas.
+            on_wait (callable, optional): Called with the caller's 1-based queue position
+                whenever it changes while waiting, and with 0 once admitted. Runs on the
+                calling thread, so it may update Streamlit elements.
+
+        Returns:
+            Ticket: The granted slot.
+
+        Raises:
+            AdmissionRejectedError: If the session is over its quota or the wait exceeds `max_wait`.
+        """
+        start = time.monotonic()
+        waiter = _Waiter(session_id)
+        with self._cond:
+            if self._enter(waiter, start):
+                return Ticket(self)
+
+        reported = None
+        try:
+            while True:
+                with self._cond:
+                    if waiter.granted:
+                        break
+                    remaining = start + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise AdmissionRejectedError("The service is busy; please try again shortly.")
+                    position = self._position(waiter)
+                    if position == reported:
+                        self._cond.wait(min(remaining, 1.0))
+                        continue
+                # Report outside the lock: the callback may be slow (e.g. a UI update)
+                reported = position
+                if on_wait is not None:
+                    on_wait(position)
+            # Still guarded: a Streamlit callback can raise RerunException/StopException here
+            if on_wait is not None and reported is not None:
+                on_wait(0)
+        except BaseException:
+            with self._cond:
+                self._withdraw(waiter)
+            raise
+        finally:
+            with self._cond:
+                self._wait_seconds += time.monotonic() - start
+        return Ticket(self)
+
+    async def acquire_async(self, session_id):
+        """
+        Asyncio variant of acquire that waits without holding a thread.
+
+        Raises:
+            AdmissionRejectedError: If the session is over its quota or the wait exceeds `max_wait`.
+        """
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        waiter = _Waiter(session_id, lambda: loop.call_soon_threadsafe(_resolve, granted))
+        with self._cond:
+            if self._enter(waiter, start):
+                return Ticket(self)
+        try:
+            await asyncio.wait_for(granted, self.max_wait)
+        except asyncio.TimeoutError:
+            with self._cond:
+                if not waiter.granted:
+                    self._timeouts += 1
+                    self._withdraw(waiter)
+                    raise AdmissionRejectedError("The service is busy; please try again shortly.") from None
+        except BaseException:
+            with self._cond:
+                self._withdraw(waiter)
+            raise
+        finally:
+            with self._cond:
+                self._wait_seconds += time.monotonic() - start
+        return Ticket(self)
+
+    def stats(self):
+        """
+        Snapshot of the admission counters.
+
+        Returns:
+            dict: in_flight, queued_now, admitted, queued (ever), rejected, timeouts and
+            mean_queue_wait_seconds (over queued requests).
+        """
+        with self._cond:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "queued_now": sum(len(queue) for queue in self._queues.values()),
+                "admitted": self._admitted,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "mean_queue_wait_seconds": self._wait_seconds / self._queued if self._queued else 0.0,
+            }
+
+
+def queue_notice(placeholder):
+    """
+    Build an `on_wait` callback that shows the user's place in line in a Streamlit placeholder.
+
+    Args:
+        placeholder: An st.empty() slot, typically inside the request's spinner.
+
+    Returns:
+        callable: Callback for stream_gemini/query_gemini `on_queue`.
+    """
+    def update(position):
+        if position:
+            placeholder.info(f"⏳ High demand right now: you are #{position} in the queue...")
+        else:
+            placeholder.empty()
+    return update
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
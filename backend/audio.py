@@ -0,0 +1,228 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+from backend.cache import DiskCache, ResponseCache, make_key
+from backend.metrics import registry, span
+from backend.tts import get_backend
+
+# Audio caches are created on first use from the optional [audio_cache] secrets section
+_memory_cache = None
+_disk_cache = None
+_init_lock = threading.Lock()
+
+# Worker pool shared by all sessions so concurrent synthesis stays bounded per process
+_executor = None
+
+# Sentence ends: terminal punctuation (incl. Devanagari danda) plus closing quotes/brackets, or a line break
+_SENTENCE_END = re.compile(r'[.!?\u0964\u0965]+["\'\)\]]*\s+|\n+')
+
+
+# Remove special characters and improve formatting
+def clean_text(text):
+    # Retain Latin letters, Indic scripts (Devanagari through Malayalam, U+0900-U+0DFF), numbers, punctuation, and spaces
+    with span("tts.clean_text"):
+        clean_text = re.sub(r'[^a-zA-Z0-9.,!?;:()\'\" \n\u0900-\u0DFF]', '', text)
+        return re.sub(r'\s+', ' ', clean_text).strip()
+
+
+def _caches():
+    global _memory_cache, _disk_cache
+    if _memory_cache is not None:
+        return _memory_cache, _disk_cache
+    with _init_lock:
+        if _memory_cache is None:
+            settings = st.secrets.get("audio_cache", {})
+            disk_dir = settings.get("disk_dir", "")
+            if disk_dir:
+                _disk_cache = DiskCache(disk_dir, max_bytes=int(settings.get("disk_max_bytes", 512 * 1024 * 1024)))
+            _memory_cache = ResponseCache(
+                max_entries=int(settings.get("max_entries", 256)),
+                max_bytes=int(settings.get("max_bytes", 64 * 1024 * 1024)),
+                ttl=float(settings.get("ttl_seconds", 24 * 3600)),
+            )
+    return _memory_cache, _disk_cache
+
+
+def synthesize_speech(text, lang='en', backend=None):
+    """
+    Convert text to speech, reusing earlier audio for identical input.
+    Audio is cached by a hash of (engine, text, lang) in memory under a byte budget and,
+    when [audio_cache] disk_dir is set, spilled to disk so it survives evictions and restarts.
+
+    Args:
+        text (str): Cleaned text to speak.
+        lang (str, optional): ISO 639-1 language code.
+        backend (TTSBackend, optional): Engine to use; chosen per language when omitted.
+
+    Returns:
+        bytes: Audio in the engine's format (`backend.mime`).
+    """
+    backend = backend or get_backend(lang)
+    memory_cache, disk_cache = _caches()
+    key = make_key(backend.cache_id, text, lang)
+
+    audio = memory_cache.get(key)
+    if audio is not None:
+        return audio
+    if disk_cache is not None:
+        audio = disk_cache.get(key)
+        if audio is not None:
+            memory_cache.set(key, audio)
+            return audio
+
+    with span("tts.synthesize", engine=backend.name):
+        audio = backend.synthesize(text, lang)
+    memory_cache.set(key, audio)
+    if disk_cache is not None:
+        disk_cache.set(key, audio)
+    return audio
+
+
+def get_audio_cache_stats():
+    """
+    Return counters for the in-memory and on-disk audio caches.
+
+    Returns:
+        dict: {"memory": ..., "disk": ... or None}.
+    """
+    memory_cache, disk_cache = _caches()
+    return {"memory": memory_cache.stats(), "disk": disk_cache.stats() if disk_cache is not None else None}
+
+
+def _collect_metrics():
+    # Audio cache gauges for the metrics export; empty until the caches exist
+    if _memory_cache is None:
+        return {}
+    stats = get_audio_cache_stats()
+    return {"audio_cache_memory": stats["memory"], "audio_cache_disk": stats["disk"] or {}}
+
+
+registry.register_collector(_collect_metrics)
+
+
+def _get_executor():
+    global _executor
+    with _init_lock:
+        if _executor is None:
+            max_workers = int(st.secrets.get("tts", {}).get("workers", 4))
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+    return _executor
+
+
+class SentenceSegmenter:
+    """
+    Split streamed text into speakable segments at sentence boundaries.
+
+    The first segment is released at the first sentence end so audio can start early;
+    later sentences are grouped until they reach `min_chars` to avoid many tiny clips.
+
+    Args:
+        min_chars (int): Minimum length of every segment after the first.
+    """
+
+    def __init__(self, min_chars=200):
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._pending = ""
+        self._threshold = 1
+
+    def feed(self, chunk):
+        """
+        Add streamed text and return the segments completed by it.
+
+        Returns:
+            list[str]: Segments ready to synthesize, in order.
+        """
+        self._buffer += chunk
+        segments = []
+        start = 0
+        # Cut at every sentence end in order, so segments depend only on the text and not
+        # on how the stream was chunked (a cache replay arrives as one chunk)
+        for match in _SENTENCE_END.finditer(self._buffer):
+            end = match.end()
+            if end == len(self._buffer):
+                break  # The whitespace after it may continue in the next chunk
+            self._pending += self._buffer[start:end]
+            start = end
+            if len(self._pending.strip()) >= self._threshold:
+                segments.append(self._pending)
+                self._pending = ""
+                self._threshold = self.min_chars
+        self._buffer = self._buffer[start:]
+        return segments
+
+    def flush(self):
+        """Return whatever text is left once the stream has ended."""
+        segment = self._pending + self._buffer
+        self._pending = self._buffer = ""
+        return [segment] if segment.strip() else []
+
+
+class SpeechPipeline:
+    """
+    Overlap speech synthesis with text generation.
+
+    Streamed text is fed in as it arrives, split into sentences, cleaned and
+    synthesized concurrently on a shared worker pool. Finished clips are handed
+    back strictly in order, so the first sentences can play while later ones are
+    still being generated. Synthesis failures are collected in `errors` instead of
+    interrupting the text stream.
+
+    Args:
+        lang (str, optional): ISO 639-1 language code.
+        backend (TTSBackend, optional): Engine to use; chosen per language when omitted.
+        min_chars (int, optional): Minimum segment length after the first sentence.
+
+    Attributes:
+        mime (str): Audio format of the clips, for st.audio.
+    """
+
+    def __init__(self, lang='en', backend=None, min_chars=200):
+        self.lang = lang
+        self.backend = backend or get_backend(lang)
+        self.mime = self.backend.mime
+        self.errors = []
+        self.segments = 0
+        self._segmenter = SentenceSegmenter(min_chars)
+        self._futures = []
+        self._next = 0
+
+    def _submit(self, segments):
+        for segment in segments:
+            text = clean_text(segment)
+            if text:
+                self._futures.append(_get_executor().submit(synthesize_speech, text, self.lang, self.backend))
+                self.segments += 1
+
+    def feed(self, chunk):
+        """Queue synthesis for every sentence completed by `chunk`."""
+        self._submit(self._segmenter.feed(chunk))
+
+    def close(self):
+        """Queue the trailing text once the stream has ended."""
+        self._submit(self._segmenter.flush())
+
+    def _results(self, block):
+        while self._next < len(self._futures):
+            future = self._futures[self._next]
+            if not block and not future.done():
+                return
+            self._next += 1
+            try:
+                yield future.result()
+            except Exception as e:
+                self.errors.append(e)
+
+    def ready(self):
+        """
+        Yield the clips that finished, in order, without waiting.
+
+        Yields:
+            bytes: Audio of the next segment(s).
+        """
+        yield from self._results(block=False)
+
+    def drain(self):
+        """Yield all remaining clips in order, waiting for each to finish."""
+        yield from self._results(block=True)
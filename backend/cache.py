@@ -0,0 +1,216 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(*parts):
+    """
+    Build a compact, fixed-size cache key from arbitrary string parts.
+
+    Args:
+        *parts: Values identifying the cached item (model, context, prompt, ...).
+
+    Returns:
+        str: Hex SHA-256 digest of the joined parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")  # Unit separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+def _sizeof(value):
+    # Only the payload is counted; keys are fixed-size digests
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(str(value).encode("utf-8"))
+
+
+class ResponseCache:
+    """
+    Thread-safe in-memory LRU cache with a per-entry TTL and a byte budget.
+
+    Entries are evicted least-recently-used first whenever the cache holds more
+    than `max_entries` items or more than `max_bytes` bytes of payload. Expired
+    entries are dropped lazily when they are looked up.
+
+    Args:
+        max_entries (int): Maximum number of entries kept.
+        max_bytes (int): Maximum total payload size in bytes.
+        ttl (float): Seconds an entry stays valid after it is stored.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, ttl=3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """
+        Return the cached value for `key`, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key):
+        """
+        Return the cached value for `key` like `get`, but without counting a hit or
+        miss or refreshing its recency (for re-checks after a counted lookup).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[2]
+
+    def set(self, key, value):
+        """
+        Store `value` under `key`, evicting old entries to stay within budget.
+        Values larger than the whole byte budget are not cached.
+        """
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, expirations, entries and bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class DiskCache:
+    """
+    Thread-safe on-disk byte store with a total size budget, used as spillover
+    behind an in-memory cache. Files are named by key; the least recently used
+    files are deleted once the directory holds more than `max_bytes`.
+
+    Args:
+        directory (str): Directory holding the cached files (created if missing).
+        max_bytes (int): Maximum total size of the cached files in bytes.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return the stored bytes for `key`, or None if absent."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            os.utime(path)  # Refresh recency for LRU eviction
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store `value` under `key`, deleting least recently used files to stay within budget."""
+        if len(value) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        with self._lock:
+            try:
+                self._bytes -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)  # Atomic, so readers never see partial files
+            self._bytes += len(value)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Called with the lock held
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith(".tmp")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Snapshot of the disk cache counters.
+
+        Returns:
+            dict: hits, misses, evictions and bytes.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self._bytes}
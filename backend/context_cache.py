@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from backend.cache import make_key
+from backend.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Rough characters per token, used to decide whether a context is worth caching
+CHARS_PER_TOKEN = 4
+
+
+class ContextCache:
+    """
+    Server-side cached contents for long system contexts, by model and context text.
+
+    A context of at least `min_tokens` (estimated) is registered once through `create`
+    and then referenced by its handle until shortly before it expires, so repeated
+    requests neither re-send nor re-bill its tokens at the full rate. Shorter contexts
+    get None and are sent as a plain system instruction. Concurrent first requests for
+    one context share a single registration, and a context whose registration failed
+    (e.g. a model version without caching support) is not retried until `ttl` passes.
+
+    Args:
+        create (callable): create(model_name, context, ttl_seconds) -> handle.
+        delete (callable, optional): Called with a handle evicted before it expired.
+        min_tokens (int, optional): Smallest context to cache; 0 disables caching.
+        ttl (float, optional): Lifetime of a cached content in seconds.
+        max_entries (int, optional): Cached contents kept at once.
+    """
+
+    def __init__(self, create, delete=None, min_tokens=32768, ttl=3600.0, max_entries=16):
+        self.min_tokens = min_tokens
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._create = create
+        self._delete = delete
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (handle or None after a failure, reuse-until time)
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.created = 0
+        self.failures = 0
+
+    def get(self, model_name, context):
+        """
+        Return the cached-content handle for a context, registering it on first use.
+
+        Args:
+            model_name (str): Model the context is cached for (caches are per model).
+            context (str): The system context.
+
+        Returns:
+            The handle from `create`, or None if the context is too short or cannot be cached.
+        """
+        if not self.min_tokens or len(context) < self.min_tokens * CHARS_PER_TOKEN:
+            return None
+        key = make_key(model_name, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                if entry[0] is not None:
+                    self.hits += 1
+                return entry[0]
+        return self._flights.do(key, self._register, key, model_name, context)
+
+    def _register(self, key, model_name, context):
+        try:
+            handle = self._create(model_name, context, self.ttl)
+        except Exception as e:
+            logger.warning("Context caching unavailable for %s: %s", model_name, e)
+            handle = None
+        # Stop using a handle a little before the server expires it
+        reuse_until = time.monotonic() + (self.ttl * 0.9 if handle is not None else self.ttl)
+        evicted = []
+        with self._lock:
+            if handle is None:
+                self.failures += 1
+            else:
+                self.created += 1
+            self._entries[key] = (handle, reuse_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[1])
+        now = time.monotonic()
+        for old, old_until in evicted:
+            if old is not None and old_until > now and self._delete is not None:
+                try:
+                    self._delete(old)  # Stop paying storage for a cache nobody will use
+                except Exception as e:
+                    logger.warning("Could not delete cached content: %s", e)
+        return handle
+
+    def stats(self):
+        """Return cached-content hits, creations, failures and live entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "created": self.created,
+                "failures": self.failures,
+                "entries": sum(1 for handle, _ in self._entries.values() if handle is not None),
+            }
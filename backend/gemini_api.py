@@ -1,41 +1,643 @@
+import asyncio
+import datetime
+import logging
 import os
-import google.generativeai as genai
-from google.api_core.exceptions import GoogleAPIError
+import threading
+import time
+from collections import OrderedDict, namedtuple
 import streamlit as st
+from backend.admission import AdmissionController, AdmissionRejectedError
+from backend.cache import ResponseCache, make_key
+from backend.context_cache import ContextCache
+from backend.metrics import registry, span
+from backend.resilience import CircuitOpenError, RateLimitExceededError, ResiliencePolicy
+from backend.singleflight import AsyncSingleFlight, SingleFlight, StreamFlight
+from backend.usage import UsageLedger, usage_from_response
 
-# Configure API Key
-gemini_key = st.secrets["api_keys"]["gemini"]
-os.environ["GOOGLE_API_KEY"] = gemini_key
-genai.configure(api_key=gemini_key)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'gemini-1.5-pro-latest'
+
+# Outcome of one item in a query_gemini_many batch; exactly one of text/error is set
+BatchResult = namedtuple("BatchResult", ["text", "error"])
+
+# The SDK, response cache and resilience policy are created on first use (see _client),
+# so importing this module neither loads google.generativeai nor reads secrets
+_genai = None
+_response_cache = None
+_policy = None
+_admission = None
+_usage = None
+_context_cache = None
+_init_lock = threading.Lock()
+
+# Process-wide pool of model clients, shared across Streamlit sessions
+_model_pool_size = 64
+_model_pool = OrderedDict()
+_model_pool_lock = threading.Lock()
+
+# Optional replacement for genai.GenerativeModel (see set_model_factory)
+_model_factory = None
+
+# Identical concurrent requests (same cache key) share one upstream call
+_query_flights = SingleFlight()
+_stream_flights = StreamFlight()
+_async_flights = AsyncSingleFlight()
+
+# Dedicated event loop for async calls; the SDK's async client is bound to the loop it was created on
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+
+def _client():
+    """
+    Import and configure the Gemini SDK and the shared cache/resilience layers once.
+
+    Returns:
+        module: The configured google.generativeai module.
+    """
+    global _genai, _response_cache, _policy, _admission, _usage, _context_cache, _model_pool_size
+    if _genai is not None:
+        return _genai
+    with _init_lock:
+        if _genai is not None:
+            return _genai
+        import google.generativeai as genai
+
+        # Configure API Key
+        gemini_key = st.secrets["api_keys"]["gemini"]
+        os.environ["GOOGLE_API_KEY"] = gemini_key
+        # Optional [gemini] transport override ("grpc" or "rest"); the SDK picks grpc by default
+        gemini_settings = st.secrets.get("gemini", {})
+        genai.configure(api_key=gemini_key, transport=gemini_settings.get("transport"))
+        _model_pool_size = int(gemini_settings.get("model_pool_size", 64))
+
+        # Retries, rate limiting and circuit breaking for every upstream call (tune to the project quota)
+        _policy = ResiliencePolicy(
+            requests_per_minute=float(gemini_settings.get("requests_per_minute", 60)),
+            burst=int(gemini_settings.get("burst", 10)),
+            max_retries=int(gemini_settings.get("max_retries", 3)),
+            backoff_base=float(gemini_settings.get("backoff_base_seconds", 1.0)),
+            backoff_max=float(gemini_settings.get("backoff_max_seconds", 20.0)),
+            max_queue_wait=float(gemini_settings.get("max_queue_wait_seconds", 30.0)),
+            failure_threshold=int(gemini_settings.get("breaker_failure_threshold", 5)),
+            reset_timeout=float(gemini_settings.get("breaker_reset_seconds", 30.0)),
+        )
+
+        # Process-wide cap on concurrent Gemini calls, shared fairly between sessions
+        admission_settings = st.secrets.get("admission", {})
+        _admission = AdmissionController(
+            max_in_flight=int(admission_settings.get("max_in_flight", 8)),
+            session_requests_per_minute=int(admission_settings.get("session_requests_per_minute", 20)),
+            max_wait=float(admission_settings.get("max_queue_wait_seconds", 60.0)),
+        )
+
+        # Long contexts are registered once as server-side cached content and referenced by
+        # handle. Gemini only caches contexts of about 32k tokens or more (model-dependent), and
+        # only for explicit model versions such as gemini-1.5-pro-002, not "-latest" aliases
+        _context_cache = ContextCache(
+            _create_cached_content,
+            delete=lambda cached_content: cached_content.delete(),
+            min_tokens=int(gemini_settings.get("context_cache_min_tokens", 32768)),
+            ttl=float(gemini_settings.get("context_cache_ttl_seconds", 3600)),
+            max_entries=int(gemini_settings.get("context_cache_max_entries", 16)),
+        )
+
+        # Token accounting per upstream call, persisted as JSONL for admin.py (empty path: memory only)
+        _usage = UsageLedger(st.secrets.get("usage", {}).get("log_path", ".cache/usage.jsonl"))
+
+        # Response cache shared by every session in this process (optional [cache] secrets override the defaults)
+        cache_settings = st.secrets.get("cache", {})
+        _response_cache = ResponseCache(
+            max_entries=int(cache_settings.get("max_entries", 1024)),
+            max_bytes=int(cache_settings.get("max_bytes", 32 * 1024 * 1024)),
+            ttl=float(cache_settings.get("ttl_seconds", 3600)),
+        )
+        _genai = genai
+    return _genai
+
+
+def _request_errors():
+    # Errors after which a request is given up and reported as "no response";
+    # resolved lazily so google.api_core is only imported once a request fails
+    from google.api_core.exceptions import GoogleAPIError
+    return (GoogleAPIError, CircuitOpenError, RateLimitExceededError, AdmissionRejectedError)
+
+
+def _session_id():
+    # Streamlit session of the calling thread; calls from outside a session share one id
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else "background"
+
+
+def _cache_key(context, prompt, image, model_name):
+    # Only text inputs are cacheable; binary/multimodal payloads always go upstream
+    if image is not None and not isinstance(image, str):
+        return None
+    return make_key(model_name, context, prompt, image or "")
+
+
+def get_cache_stats():
+    """
+    Return hit/miss counters and occupancy of the Gemini response cache.
+
+    Returns:
+        dict: Cache statistics (see ResponseCache.stats).
+    """
+    _client()
+    return _response_cache.stats()
+
+
+def get_coalescing_stats():
+    """
+    Return how many requests ran upstream (leaders) and how many joined an identical
+    in-flight request instead (followers), per call style.
+
+    Returns:
+        dict: {"query": ..., "stream": ..., "async": ...}.
+    """
+    return {"query": _query_flights.stats(), "stream": _stream_flights.stats(), "async": _async_flights.stats()}
+
+
+def get_admission_stats():
+    """
+    Return in-flight, queue and quota counters of the Gemini admission controller.
+
+    Returns:
+        dict: Admission statistics (see AdmissionController.stats).
+    """
+    _client()
+    return _admission.stats()
+
+
+def get_context_cache_stats():
+    """
+    Return hits, creations and failures of server-side context caching.
+
+    Returns:
+        dict: Context cache statistics (see ContextCache.stats).
+    """
+    _client()
+    return _context_cache.stats()
+
+
+def get_resilience_stats():
+    """
+    Return retry, rate-limit and circuit breaker metrics for Gemini calls.
+
+    Returns:
+        dict: Policy statistics (see ResiliencePolicy.stats).
+    """
+    _client()
+    return _policy.stats()
+
+
+def _collect_metrics():
+    # Cache, resilience, admission and coalescing gauges for the metrics export;
+    # empty until the first request has initialized the client
+    if _genai is None:
+        return {}
+    groups = {
+        "gemini_cache": _response_cache.stats(),
+        "gemini_resilience": _policy.stats(),
+        "gemini_admission": _admission.stats(),
+        "gemini_context_cache": _context_cache.stats(),
+    }
+    for style, stats in get_coalescing_stats().items():
+        groups[f"gemini_coalescing_{style}"] = stats
+    return groups
+
+
+registry.register_collector(_collect_metrics)
+
+
+def get_usage_totals():
+    """
+    Return token usage of this process per (page, mode, tone, language).
+
+    Returns:
+        dict: Usage totals (see UsageLedger.totals).
+    """
+    _client()
+    return _usage.totals()
+
+
+def _record_usage(tags, model_name, response, seconds):
+    # Token accounting for one upstream call, also exported as counters
+    usage = usage_from_response(response)
+    _usage.record(tags, model_name, usage, seconds)
+    page = (tags or {}).get("page", "")
+    registry.increment("gemini_tokens", usage["prompt_tokens"], kind="prompt", page=page)
+    registry.increment("gemini_tokens", usage["output_tokens"], kind="output", page=page)
+    registry.increment("gemini_tokens", usage["cached_tokens"], kind="cached", page=page)
+
+
+def _admit(session_id, on_queue):
+    # Wait for an admission slot, recording the time spent queued
+    with span("gemini.admission_wait"):
+        return _admission.acquire(session_id, on_queue)
+
+
+def _freeze(config):
+    # Hashable form of a generation config dict for use in pool keys
+    if config is None:
+        return None
+    return tuple(sorted((name, _freeze(value) if isinstance(value, dict) else value) for name, value in dict(config).items()))
+
+
+def set_model_factory(factory):
+    """
+    Build models with `factory` instead of the Gemini SDK, e.g. a local stub for load tests.
+
+    Everything above the model (cache, coalescing, admission, resilience, usage) still
+    runs, so only the network is taken out of the picture; server-side context caching
+    is skipped. Pooled models are discarded.
+
+    Args:
+        factory (callable): Called as factory(model_name, system_instruction, generation_config)
+            and returning an object with generate_content/generate_content_async; None
+            restores the SDK.
+    """
+    global _model_factory
+    with _model_pool_lock:
+        _model_factory = factory
+        _model_pool.clear()
+
+
+def get_model(model_name=DEFAULT_MODEL, system_instruction=None, generation_config=None, cached_content=None):
+    """
+    Return a pooled GenerativeModel for the given model name, system instruction and
+    generation config, creating it on first use. All pooled models share the SDK's
+    long-lived generative client, so its connection is reused across calls and sessions.
+
+    Args:
+        model_name (str, optional): Gemini model to use.
+        system_instruction (str, optional): System instruction baked into the model.
+        generation_config (dict, optional): Default generation parameters.
+        cached_content (caching.CachedContent, optional): Server-side cached context to
+            build the model from instead of `system_instruction`.
+
+    Returns:
+        genai.GenerativeModel: A model instance safe to share between threads.
+    """
+    genai = _client()
+    cached_name = cached_content.name if cached_content is not None else None
+    key = (model_name, system_instruction, _freeze(generation_config), cached_name)
+    with _model_pool_lock:
+        model = _model_pool.get(key)
+        if model is not None:
+            _model_pool.move_to_end(key)
+            return model
+
+        if _model_factory is not None:
+            model = _model_pool[key] = _model_factory(model_name, system_instruction, generation_config)
+            return model
+
+        from google.generativeai import client as genai_client
+        if cached_content is not None:
+            model = genai.GenerativeModel.from_cached_content(cached_content, generation_config=generation_config)
+        else:
+            model = genai.GenerativeModel(
+                model_name,
+                system_instruction=system_instruction,
+                generation_config=generation_config,
+            )
+        # Bind the shared client here, under the lock, so concurrent first calls
+        # cannot each open their own channel
+        model._client = genai_client.get_default_generative_client()
+        _model_pool[key] = model
+        if len(_model_pool) > _model_pool_size:
+            _model_pool.popitem(last=False)
+        return model
+
+
+def _create_cached_content(model_name, context, ttl):
+    # Register a context as cached content on the Gemini side (see ContextCache)
+    from google.generativeai import caching
+    return caching.CachedContent.create(
+        model=model_name,
+        system_instruction=context,
+        ttl=datetime.timedelta(seconds=ttl),
+    )
+
+
+def _model_for(context, model_name):
+    # The model with `context` as its system instruction: referenced by cached-content
+    # handle when the context is long enough to cache server-side, otherwise inline
+    if context and _model_factory is None:
+        cached_content = _context_cache.get(model_name, context)
+        if cached_content is not None:
+            return get_model(model_name, cached_content=cached_content)
+    return get_model(model_name, system_instruction=context or None)
+
+
+def _build_contents(prompt, image):
+    # The user turn: the prompt, plus the image when one is included
+    if image:
+        return [prompt, image]
+    return prompt
+
+
+def _parse_response(response):
+    # Join the text parts of the first candidate, or None if there is none
+    if hasattr(response, 'candidates') and response.candidates:
+        return ' '.join(part.text for part in response.candidates[0].content.parts)
+    return None
+
+
+def _open_stream(model, contents):
+    # Start a streamed generation and wait for its first chunk, so that failures
+    # before any text is shown can still be retried
+    iterator = iter(model.generate_content(contents, stream=True))
+    return next(iterator, None), iterator
+
+
+def _chunk_text(chunk):
+    # Chunks without candidates (e.g. trailing safety/usage frames) carry no text
+    if chunk is None or not chunk.candidates:
+        return ''
+    return ''.join(part.text for part in chunk.candidates[0].content.parts)
+
+
+def _background_loop():
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gemini-async", daemon=True).start()
+            _async_loop = loop
+    return _async_loop
+
+
+async def _on_background_loop(coro):
+    # Run `coro` on the shared loop and await it from whichever loop we are on
+    loop = _background_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def _admit_async(session_id):
+    # Wait for an admission slot on the loop itself, so waiters hold no executor threads
+    with span("gemini.admission_wait"):
+        return await _admission.acquire_async(session_id)
+
+
+async def _generate_async(context, prompt, image, model_name, use_cache, tags=None, session_id=None):
+    # Cached async generation; raises on failure instead of returning None.
+    # Admitted under `session_id`; None skips admission (offline batches)
+    _client()
+    key = _cache_key(context, prompt, image, model_name) if use_cache else None
+    if key is None:
+        return await _generate_upstream_async(None, context, prompt, image, model_name, tags, session_id)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+    return await _async_flights.do(
+        key, _generate_upstream_async, key, context, prompt, image, model_name, tags, session_id
+    )
+
+
+async def _generate_upstream_async(key, context, prompt, image, model_name, tags=None, session_id=None):
+    # Re-check the cache: an identical call may have finished since the caller's lookup
+    if key is not None:
+        cached = _response_cache.peek(key)
+        if cached is not None:
+            return cached
+    # Off the loop and before admission: registering a long context as cached content is a
+    # blocking call, and it must not hold a slot while it waits for an executor thread
+    model = await asyncio.to_thread(_model_for, context, model_name)
+    ticket = await _admit_async(session_id) if session_id is not None else None
+    try:
+        start = time.perf_counter()
+        with span("gemini.generate_async", model=model_name):
+            response = await _policy.call_async(model.generate_content_async, _build_contents(prompt, image))
+    finally:
+        if ticket is not None:
+            ticket.release()
+    _record_usage(tags, model_name, response, time.perf_counter() - start)
+    text = _parse_response(response)
+    if text is None:
+        raise ValueError("Unexpected response format from Gemini API.")
+    if key is not None and text:
+        _response_cache.set(key, text)
+    return text
 
 
 # Function to query Gemini model
-def query_gemini(context, prompt, image=None):
+def query_gemini(context, prompt, image=None, model_name=DEFAULT_MODEL, use_cache=True, on_queue=None, tags=None):
     """
     Query the Gemini model with a given context and prompt, optionally including an image.
+    Text-only answers are served from an in-process LRU+TTL cache when the same
+    (context, prompt, model) was answered recently, and identical requests arriving
+    while one is in flight wait for it instead of calling the model again. Calls that
+    do reach the model first pass the process-wide admission queue.
 
     Args:
-        context (str): Context for the prompt.
+        context (str): System instruction for the model; long ones are cached server-side.
         prompt (str): User prompt to generate content.
         image (str, optional): Path to an image file for multimodal inputs.
+        model_name (str, optional): Gemini model to query.
+        use_cache (bool, optional): Set to False to always call the model.
+        on_queue (callable, optional): Called with the caller's queue position while it
+            waits for admission, and with 0 once admitted (see admission.queue_notice).
+        tags (dict, optional): page/mode/tone/language attributes for token accounting.
 
     Returns:
         str: Generated content from the Gemini model or None if an error occurs.
     """
+    _client()
+    key = _cache_key(context, prompt, image, model_name) if use_cache else None
+    if key is None:
+        return _generate_upstream(None, context, prompt, image, model_name, on_queue, tags)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+    # Concurrent identical requests wait for the one already in flight
+    return _query_flights.do(key, _generate_upstream, key, context, prompt, image, model_name, on_queue, tags)
+
+
+def _generate_upstream(key, context, prompt, image, model_name, on_queue=None, tags=None):
+    # One upstream call for query_gemini; returns None on failure
+    if key is not None:
+        cached = _response_cache.peek(key)
+        if cached is not None:
+            return cached
+
     try:
-        # Choose the Gemini model
-        model = genai.GenerativeModel('gemini-1.5-pro-latest')
+        with _admit(_session_id(), on_queue):
+            # Choose the Gemini model
+            model = _model_for(context, model_name)
+            start = time.perf_counter()
+            with span("gemini.generate", model=model_name):
+                response = _policy.call(model.generate_content, _build_contents(prompt, image))
+    except _request_errors() as e:
+        logger.warning("Gemini request failed: %s", e)
+        return None
+    _record_usage(tags, model_name, response, time.perf_counter() - start)
 
-        # Generate content based on whether an image is included
-        if image:
-            response = model.generate_content([context + prompt, image])
-        else:
-            response = model.generate_content(context + prompt)
+    # Parse response
+    text = _parse_response(response)
+    if text is None:
+        logger.warning("Unexpected response format from Gemini API.")
+        return None
+
+    # Only successful generations are cached; errors are retried on the next call
+    if key is not None and text:
+        _response_cache.set(key, text)
+    return text
 
-        # Parse response
-        if hasattr(response, 'candidates') and response.candidates:
-            return ' '.join(part.text for part in response.candidates[0].content.parts)
+
+def stream_gemini(context, prompt, image=None, model_name=DEFAULT_MODEL, use_cache=True, on_queue=None, tags=None):
+    """
+    Streaming variant of query_gemini that yields text chunks as the model produces them.
+    A cached answer is yielded as a single chunk; a completed stream is added to the cache.
+    Identical concurrent requests share one upstream stream: a late joiner first receives
+    the chunks produced so far, then the rest as they arrive.
+
+    Args:
+        context (str): System instruction for the model; long ones are cached server-side.
+        prompt (str): User prompt to generate content.
+        image (str, optional): Path to an image file for multimodal inputs.
+        model_name (str, optional): Gemini model to query.
+        use_cache (bool, optional): Set to False to always call the model.
+        on_queue (callable, optional): Called with the caller's queue position while it
+            waits for admission, and with 0 once admitted (see admission.queue_notice).
+        tags (dict, optional): page/mode/tone/language attributes for token accounting.
+
+    Yields:
+        str: Successive pieces of the generated content; nothing if the request fails.
+    """
+    _client()
+    key = _cache_key(context, prompt, image, model_name) if use_cache else None
+    if key is not None:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    # Admission is taken on the caller's thread, so on_queue can update its UI
+    session_id = _session_id()
+    try:
+        if key is None:
+            with _admit(session_id, on_queue):
+                yield from _stream_upstream(None, context, prompt, image, model_name, tags)
         else:
-            return "Unexpected response format from Gemini API."
-    except GoogleAPIError as e:
-        return f"An error occurred while querying the Gemini API: {e}"
+            # Concurrent identical requests read the chunks of the one stream already in flight
+            yield from _stream_flights.subscribe(
+                key, _stream_upstream, key, context, prompt, image, model_name, tags,
+                admit=lambda: _admit(session_id, on_queue),
+            )
+    except AdmissionRejectedError as e:
+        logger.warning("Gemini streaming request not admitted: %s", e)
+
+
+def _stream_upstream(key, context, prompt, image, model_name, tags=None):
+    # One streamed upstream call for stream_gemini; yields nothing more after a failure
+    if key is not None:
+        cached = _response_cache.peek(key)
+        if cached is not None:
+            yield cached
+            return
+
+    chunks = []
+    start = time.perf_counter()
+    try:
+        model = _model_for(context, model_name)
+        first, iterator = _policy.call(_open_stream, model, _build_contents(prompt, image))
+        registry.observe("gemini.stream.first_chunk", time.perf_counter() - start, model=model_name)
+        last = first
+        text = _chunk_text(first)
+        if text:
+            chunks.append(text)
+            yield text
+        for chunk in iterator:
+            last = chunk
+            text = _chunk_text(chunk)
+            if text:
+                chunks.append(text)
+                yield text
+    except _request_errors() as e:
+        # A stream cut short after its first chunk is shown as-is but never cached
+        registry.increment("stage_errors", stage="gemini.stream")
+        logger.warning("Gemini streaming request failed: %s", e)
+        return
+    seconds = time.perf_counter() - start
+    registry.observe("gemini.stream", seconds, model=model_name)
+    # The final chunk carries the usage metadata of the whole stream
+    _record_usage(tags, model_name, last, seconds)
+
+    if not chunks:
+        logger.warning("Unexpected response format from Gemini API.")
+    elif key is not None:
+        _response_cache.set(key, ''.join(chunks))
+
+
+async def query_gemini_async(context, prompt, image=None, model_name=DEFAULT_MODEL, use_cache=True, tags=None):
+    """
+    Asyncio-native variant of query_gemini. Safe to await from any event loop; the
+    request itself runs on a shared background loop that owns the async client. Calls
+    that reach the model pass the same process-wide admission queue, under the
+    caller's Streamlit session.
+
+    Args:
+        context (str): System instruction for the model; long ones are cached server-side.
+        prompt (str): User prompt to generate content.
+        image (str, optional): Path to an image file for multimodal inputs.
+        model_name (str, optional): Gemini model to query.
+        use_cache (bool, optional): Set to False to always call the model.
+        tags (dict, optional): page/mode/tone/language attributes for token accounting.
+
+    Returns:
+        str: Generated content from the Gemini model or None if an error occurs.
+    """
+    try:
+        session_id = _session_id()  # Resolved here: the background loop has no session
+        return await _on_background_loop(
+            _generate_async(context, prompt, image, model_name, use_cache, tags, session_id)
+        )
+    except _request_errors() + (ValueError,) as e:
+        logger.warning("Gemini request failed: %s", e)
+        return None
+
+
+def query_gemini_many(requests, max_concurrency=4, model_name=DEFAULT_MODEL, use_cache=True):
+    """
+    Run several Gemini generations concurrently and return their results in input order.
+    Blocks the calling thread; do not call it from inside a running event loop.
+    Meant for offline jobs: it bypasses the admission queue and session quotas, and
+    `max_concurrency` bounds its load instead.
+
+    Args:
+        requests (list): Dicts with "context" and "prompt" keys, and optionally "image",
+            "model_name" to override the batch-wide model and "tags" for token accounting.
+        max_concurrency (int, optional): Maximum number of requests in flight at once.
+        model_name (str, optional): Gemini model used for items that do not set one.
+        use_cache (bool, optional): Set to False to always call the model.
+
+    Returns:
+        list[BatchResult]: One result per request, with either `text` or `error` set.
+    """
+    async def run_all():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(request):
+            async with semaphore:
+                try:
+                    text = await _generate_async(
+                        request["context"],
+                        request["prompt"],
+                        request.get("image"),
+                        request.get("model_name", model_name),
+                        use_cache,
+                        request.get("tags"),
+                    )
+                    return BatchResult(text=text, error=None)
+                except Exception as e:
+                    # Any failure belongs to its item; the rest of the batch still completes
+                    return BatchResult(text=None, error=e)
+
+        return await asyncio.gather(*(run_one(request) for request in requests))
+
+    return asyncio.run_coroutine_threadsafe(run_all(), _background_loop()).result()
@@ -0,0 +1,55 @@
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+# Era histories for the Indian History tab: one markdown file per era plus an ordered index
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content", "history")
+
+# Index file format versions this loader understands
+SUPPORTED_VERSIONS = (1,)
+
+
+@dataclass(frozen=True, slots=True)
+class Era:
+    """One entry of the history index: the label shown in the UI and its markdown file."""
+
+    label: str
+    path: str
+
+
+def load_era_index(directory=HISTORY_DIR):
+    """
+    Read the ordered era index without touching the era files themselves.
+
+    Args:
+        directory (str, optional): Folder holding index.json and the markdown files.
+
+    Returns:
+        MappingProxyType: Read-only mapping of era label -> Era, in display order.
+
+    Raises:
+        ValueError: If the index version is not supported.
+    """
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    version = data.get("version")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported history index version: {version!r}")
+    return MappingProxyType({
+        raw["label"]: Era(raw["label"], os.path.join(directory, raw["file"])) for raw in data["eras"]
+    })
+
+
+def read_era(era):
+    """
+    Load the markdown of one era, ready to pass to st.markdown.
+
+    Args:
+        era (Era): Entry from load_era_index.
+
+    Returns:
+        str: The era's markdown.
+    """
+    with open(era.path, encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from types import MappingProxyType
+from backend.cache import make_key
+
+# Pre-generated VedBase insights, written by scripts/pregenerate_insights.py
+INSIGHTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "insights.json")
+
+# Artifact format versions this loader understands
+SUPPORTED_VERSIONS = (1,)
+ARTIFACT_VERSION = 1
+
+# Response languages offered by the app (code -> name used in the prompt)
+LANGUAGES = {"en": "English", "hi": "Hindi"}
+
+
+def insight_request(knowledge_base, category, title, mandal=None, language="en"):
+    """
+    Build the Gemini request for an insight on a text or one of its mandals.
+
+    The UI and the pre-generation job both use this, so a stored insight is found
+    exactly when the live request would be the same.
+
+    Args:
+        knowledge_base (KnowledgeBase): The loaded knowledge base.
+        category (str): Category name, e.g. "Vedas".
+        title (str): Text title within the category.
+        mandal (int, optional): Mandal number, for texts divided into mandals.
+        language (str, optional): Response language code (see LANGUAGES).
+
+    Returns:
+        dict: {"context": ..., "prompt": ...}, as accepted by query_gemini_many.
+    """
+    context = f"{knowledge_base.category(category).description}\n"
+    if mandal is None:
+        prompt = f"Explain the spiritual and practical wisdom of {title} in detail, focusing on its significance in Sanatan Dharma."
+    else:
+        description = knowledge_base.mandal(category, title, mandal).description
+        prompt = f"Explain the spiritual and practical wisdom of the Mandal selected: {description}, focusing on its significance in Sanatan Dharma."
+    prompt += f" Respond in {LANGUAGES[language]}."
+    return {"context": context, "prompt": prompt}
+
+
+def iter_insight_subjects(knowledge_base, languages=tuple(LANGUAGES)):
+    """
+    Enumerate every insight the VedBase tab can ask for.
+
+    Texts divided into mandals are covered per mandal (the UI only offers mandal
+    insights for them); other texts are covered as a whole.
+
+    Yields:
+        tuple: (category, title, mandal or None, language).
+    """
+    for category in knowledge_base.categories():
+        for title in knowledge_base.titles(category):
+            mandals = knowledge_base.mandal_numbers(category, title) or (None,)
+            for mandal in mandals:
+                for language in languages:
+                    yield category, title, mandal, language
+
+
+def fingerprint(request, model_name):
+    """Key of a stored insight: changes whenever the request text or the model changes."""
+    return make_key(model_name, request["context"], request["prompt"])
+
+
+class InsightStore:
+    """
+    Read-only view of the pre-generated insights artifact.
+
+    Entries are keyed by the fingerprint of the exact request that produced them, so
+    edits to the knowledge base or the prompt simply turn affected entries into misses.
+
+    Args:
+        data (dict): Parsed artifact ({"version": ..., "model": ..., "insights": {...}}).
+
+    Raises:
+        ValueError: If the artifact version is not supported.
+    """
+
+    def __init__(self, data):
+        version = data.get("version", ARTIFACT_VERSION)
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported insights artifact version: {version!r}")
+        self.model = data.get("model")
+        self.generated_at = data.get("generated_at")
+        self._insights = MappingProxyType(dict(data.get("insights", {})))
+
+    def __len__(self):
+        return len(self._insights)
+
+    @classmethod
+    def load(cls, path=INSIGHTS_PATH):
+        """
+        Load the artifact; a missing file gives an empty store.
+
+        Args:
+            path (str, optional): Path to the JSON artifact.
+
+        Returns:
+            InsightStore: The loaded insights.
+        """
+        if not os.path.exists(path):
+            return cls({})
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def get(self, request, model_name):
+        """
+        Return the stored insight for a request, or None if it was not pre-generated.
+        """
+        entry = self._insights.get(fingerprint(request, model_name))
+        return entry["text"] if entry else None
+
+    def entries(self):
+        """Return the raw artifact entries (fingerprint -> entry)."""
+        return self._insights
+
+
+def save_insights(path, model_name, insights):
+    """
+    Write the artifact atomically so a running app never reads a partial file.
+
+    Args:
+        path (str): Destination path.
+        model_name (str): Model the insights were generated with.
+        insights (dict): fingerprint -> {"category", "title", "mandal", "language", "text"}.
+    """
+    data = {
+        "version": ARTIFACT_VERSION,
+        "model": model_name,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "insights": insights,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
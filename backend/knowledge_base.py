@@ -0,0 +1,133 @@
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+# Versioned knowledge-base data file shipped with the app
+KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "knowledge_base.json")
+
+# Data file format versions this loader understands
+SUPPORTED_VERSIONS = (1,)
+
+
+@dataclass(frozen=True, slots=True)
+class Mandal:
+    """One mandal (book) of a text."""
+
+    number: int
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class Text:
+    """A sacred text, chapter or topic within a category."""
+
+    title: str
+    content: str
+    mandals: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    """A knowledge area such as the Vedas or the Upanishads."""
+
+    name: str
+    description: str
+    texts: tuple = ()
+
+
+class KnowledgeBase:
+    """
+    Immutable, indexed view of the knowledge-base data file.
+
+    Records are frozen dataclasses and every index is a read-only mapping, so one
+    instance can be shared by all sessions (st.cache_resource) without copies.
+    Lookups are dictionary based: category -> title -> record, and mandals by number
+    within a text, so they stay O(1) as the number of texts and verses grows.
+    Insertion order from the data file is preserved for display.
+
+    Args:
+        data (dict): Parsed data file ({"version": ..., "categories": [...]}).
+
+    Raises:
+        ValueError: If the data file version is not supported.
+    """
+
+    __slots__ = ("version", "_categories", "_texts", "_titles", "_mandals")
+
+    def __init__(self, data):
+        version = data.get("version")
+        if version not in SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported knowledge base version: {version!r}")
+
+        categories = {}
+        texts = {}  # (category, title) -> Text
+        titles = {}  # category -> tuple of titles
+        mandals = {}  # (category, title) -> {number: Mandal}
+        for raw_category in data["categories"]:
+            name = raw_category["name"]
+            category_texts = tuple(
+                Text(
+                    title=raw_text["title"],
+                    content=raw_text["content"],
+                    mandals=tuple(Mandal(raw["number"], raw["description"]) for raw in raw_text.get("mandals", ())),
+                )
+                for raw_text in raw_category["examples"]
+            )
+            categories[name] = Category(name, raw_category["description"], category_texts)
+            titles[name] = tuple(text.title for text in category_texts)
+            for text in category_texts:
+                texts[(name, text.title)] = text
+                if text.mandals:
+                    mandals[(name, text.title)] = MappingProxyType({mandal.number: mandal for mandal in text.mandals})
+
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "_categories", MappingProxyType(categories))
+        object.__setattr__(self, "_texts", MappingProxyType(texts))
+        object.__setattr__(self, "_titles", MappingProxyType(titles))
+        object.__setattr__(self, "_mandals", MappingProxyType(mandals))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("KnowledgeBase is read-only")
+
+    @classmethod
+    def load(cls, path=KNOWLEDGE_BASE_PATH):
+        """
+        Load and index a knowledge-base data file.
+
+        Args:
+            path (str, optional): Path to the JSON data file.
+
+        Returns:
+            KnowledgeBase: The indexed knowledge base.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def categories(self):
+        """Return category names in display order."""
+        return tuple(self._categories)
+
+    def category(self, name):
+        """Return the Category record."""
+        return self._categories[name]
+
+    def titles(self, category):
+        """Return the titles of a category's texts in display order."""
+        return self._titles[category]
+
+    def example(self, category, title):
+        """Return the Text record for one text."""
+        return self._texts[(category, title)]
+
+    def has_mandals(self, category, title):
+        """Return True if the text is divided into mandals."""
+        return (category, title) in self._mandals
+
+    def mandal_numbers(self, category, title):
+        """Return the mandal numbers of a text in display order (empty if it has none)."""
+        return tuple(self._mandals.get((category, title), ()))
+
+    def mandal(self, category, title, number):
+        """Return the Mandal record of a text."""
+        return self._mandals[(category, title)][number]
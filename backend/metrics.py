@@ -0,0 +1,286 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every exported metric name
+NAMESPACE = "symphonic"
+
+# Latency bucket upper bounds in seconds: fine below a second for local stages
+# (prompt build, text cleaning, rendering), coarse up to a minute for Gemini and TTS
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+class Histogram:
+    """
+    Cumulative-bucket latency histogram in the Prometheus style.
+
+    Args:
+        buckets (tuple[float], optional): Sorted bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation within its bucket (as histogram_quantile does).
+
+        Returns:
+            float: Estimated value in seconds, or 0.0 with no observations.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= target and count:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (target - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of per-stage latency histograms and counters.
+
+    Stages are free-form names such as "gemini.stream" or "tts.synthesize"; optional
+    labels (e.g. page="vedagpt") split a stage further. Collectors registered with
+    `register_collector` contribute point-in-time gauges (cache, resilience and
+    admission stats) at export time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels = ()
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+
+    def observe(self, stage, seconds, **labels):
+        key = (stage, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_constant_labels(self, **labels):
+        """Add labels to every exported series, e.g. app="veda" to tell processes apart."""
+        with self._lock:
+            self._labels = tuple(sorted(labels.items()))
+
+    def register_collector(self, collect):
+        """
+        Add a function returning {prefix: stats dict} to be exported as gauges.
+        It should return an empty dict while its component is not initialized.
+        """
+        with self._lock:
+            self._collectors.append(collect)
+
+    def summary(self):
+        """
+        Per-stage latency percentiles for quick inspection.
+
+        Returns:
+            dict: (stage, labels) -> {"count", "p50", "p95", "p99", "mean"} in seconds.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "count": h.count,
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                    "p99": h.quantile(0.99),
+                    "mean": h.sum / h.count if h.count else 0.0,
+                }
+                for key, h in self._histograms.items()
+            }
+
+    def render_prometheus(self):
+        """
+        Export everything in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            collectors = list(self._collectors)
+            constant = self._labels
+
+        name = f"{NAMESPACE}_stage_duration_seconds"
+        lines += [f"# HELP {name} Time spent per request stage.", f"# TYPE {name} histogram"]
+        for (stage, labels), h in histograms:
+            base = constant + (("stage", stage),) + labels
+            cumulative = 0
+            for bound, count in zip(h.buckets + (float("inf"),), h.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{name}_bucket{_labels(base + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(base)} {h.sum}")
+            lines.append(f"{name}_count{_labels(base)} {h.count}")
+
+        for counter in sorted({name for (name, _), _ in counters}):
+            metric = f"{NAMESPACE}_{_sanitize(counter)}_total"
+            lines += [f"# TYPE {metric} counter"]
+            lines += [f"{metric}{_labels(constant + labels)} {value}" for (n, labels), value in counters if n == counter]
+
+        for collect in collectors:
+            try:
+                groups = collect()
+            except Exception:
+                continue  # A broken collector must not break the export
+            for prefix, stats in groups.items():
+                lines += _gauge_lines(prefix, stats, constant)
+        return "\n".join(lines) + "\n"
+
+
+def _sanitize(name):
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _gauge_lines(prefix, stats, constant=()):
+    # Numeric stats become gauges; string stats (e.g. circuit state) become info-style gauges set to 1
+    lines = []
+    for key, value in sorted(stats.items()):
+        metric = f"{NAMESPACE}_{_sanitize(prefix)}_{_sanitize(key)}"
+        if isinstance(value, (int, float)):
+            lines += [f"# TYPE {metric} gauge", f"{metric}{_labels(constant)} {float(value)}"]
+        elif isinstance(value, str):
+            lines += [f"# TYPE {metric} gauge", f"{metric}{_labels(constant + (('value', value),))} 1"]
+    return lines
+
+
+# Process-wide registry shared by every session and backend module
+registry = MetricsRegistry()
+
+
+@contextmanager
+def span(stage, **labels):
+    """
+    Time a block of code as one stage of a request.
+
+    Errors raised inside the block are counted in `stage_errors` and re-raised.
+
+    Args:
+        stage (str): Stage name, e.g. "prompt.build".
+        **labels: Extra labels, e.g. page="symphonic".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.increment("stage_errors", stage=stage, **labels)
+        raise
+    finally:
+        registry.observe(stage, time.perf_counter() - start, **labels)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # Scrapes are not worth a log line each
+
+
+def write_textfile(path):
+    """Write the exposition text atomically, e.g. for node_exporter's textfile collector."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render_prometheus())
+    os.replace(tmp_path, path)
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters(app):
+    """
+    Start the exporters configured in the optional [metrics] secrets section, once per process.
+
+    http_port serves /metrics on http_host (default 127.0.0.1); textfile_path is rewritten
+    every textfile_interval_seconds. With neither set, metrics are only kept in memory.
+    Each app runs in its own `streamlit run` process, so a [metrics.<app>] table overrides
+    these settings per app (its own port and file), and every series is labelled app="<app>".
+
+    Args:
+        app (str): Name of the calling app, e.g. "symphonic" or "veda".
+    """
+    global _exporters_started
+    if _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        import streamlit as st  # Only the apps start exporters; timing spans stay dependency-free
+        shared = st.secrets.get("metrics", {})
+        settings = {key: value for key, value in shared.items() if not isinstance(value, Mapping)}
+        settings.update(shared.get(app, {}))
+        registry.set_constant_labels(app=app)
+        port = int(settings.get("http_port", 0))
+        if port:
+            try:
+                server = ThreadingHTTPServer((settings.get("http_host", "127.0.0.1"), port), _Handler)
+            except OSError as e:
+                # e.g. a second app process on the same host; metrics stay in memory
+                logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+            else:
+                threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        path = settings.get("textfile_path", "")
+        if path:
+            interval = float(settings.get("textfile_interval_seconds", 15))
+
+            def write_forever():
+                while True:
+                    try:
+                        write_textfile(path)
+                    except OSError:
+                        pass
+                    time.sleep(interval)
+
+            threading.Thread(target=write_forever, name="metrics-textfile", daemon=True).start()
@@ -0,0 +1,90 @@
+import json
+import re
+import threading
+import time
+import unicodedata
+import streamlit as st
+
+# Zero-width characters: they change how a conjunct or word is drawn, not what it says
+_INVISIBLE = dict.fromkeys((0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF))
+
+# Typographic variants folded to their ASCII form, and double quotes dropped, so they do not split cache keys
+_PUNCTUATION = str.maketrans({
+    **dict.fromkeys("\u2018\u2019\u201a\u201b", "'"),         # single quotes -> apostrophe
+    **dict.fromkeys("\u201c\u201d\u201e\u201f\"", None),      # double quotes -> removed
+    **dict.fromkeys("\u2010\u2011\u2012\u2013\u2014\u2015", "-"),  # hyphens and dashes -> "-"
+    "\u2026": "...",                                           # ellipsis
+})
+
+# Runs of the same sentence punctuation ("!!!", "??", double dandas) collapse to one mark
+_REPEATED = re.compile(r"([!?.,;:\u0964\u0965])\1+")
+_SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([!?.,;:\u0964\u0965])")
+_WHITESPACE = re.compile(r"\s+")
+
+# Optional JSONL query log, used to measure cache hit rates offline
+_log_lock = threading.Lock()
+
+
+def _is_edge_punctuation(ch):
+    # Unicode punctuation (incl. the Devanagari danda), but not symbols such as emoji or currency
+    return unicodedata.category(ch).startswith("P")
+
+
+def _fold_digits(text):
+    # Decimal digits of any script (e.g. Devanagari or Odia numerals) become ASCII 0-9
+    return "".join(str(unicodedata.digit(ch)) if ch.isdecimal() and not ch.isascii() else ch for ch in text)
+
+
+def canonicalize_query(text):
+    """
+    Reduce a user query to a canonical form so trivially different inputs share one
+    prompt and one cache entry ("Love", " love ", "LOVE!" -> "love").
+
+    Steps: Unicode NFC (precomposed and decomposed Devanagari match); removal of
+    zero-width joiners and spaces; case folding, which only affects cased scripts
+    such as Latin, so Indic text is untouched; native decimal digits folded to ASCII;
+    typographic apostrophes and dashes folded to ASCII; double quotes removed;
+    repeated punctuation collapsed; and all Unicode whitespace collapsed to single
+    spaces. Punctuation at either end,
+    including a trailing danda, is dropped. Punctuation inside the query is kept, so
+    "what's" and "1857-1947" survive.
+
+    Args:
+        text (str): Raw query as typed.
+
+    Returns:
+        str: Canonical query; empty if the input had no content.
+    """
+    text = unicodedata.normalize("NFC", text).translate(_INVISIBLE)
+    text = _fold_digits(text.casefold()).translate(_PUNCTUATION)
+    text = _WHITESPACE.sub(" ", text)
+    text = _REPEATED.sub(r"\1", _SPACE_BEFORE_PUNCTUATION.sub(r"\1", text))
+    start, end = 0, len(text)
+    while start < end and (text[start].isspace() or _is_edge_punctuation(text[start])):
+        start += 1
+    while end > start and (text[end - 1].isspace() or _is_edge_punctuation(text[end - 1])):
+        end -= 1
+    return text[start:end]
+
+
+def log_query(page, raw, canonical):
+    """
+    Append a query to the JSONL log set by [query_log] path in secrets (no-op when unset).
+
+    The log feeds benchmarks/replay_queries.py, which compares cache hit rates of
+    raw and canonical queries.
+
+    Args:
+        page (str): Where the query was entered, e.g. "symphonic" or "vedagpt".
+        raw (str): Query as typed.
+        canonical (str): Result of canonicalize_query.
+    """
+    path = st.secrets.get("query_log", {}).get("path", "")
+    if not path:
+        return
+    record = json.dumps({"ts": time.time(), "page": page, "raw": raw, "canonical": canonical}, ensure_ascii=False)
+    try:
+        with _log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(record + "\n")
+    except OSError:
+        pass  # Logging must never break a request
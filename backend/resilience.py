@@ -0,0 +1,332 @@
+import asyncio
+import functools
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def retryable_errors():
+    """
+    Upstream errors worth retrying: quota bursts, overload and transient server faults.
+    Resolved on first use so importing this module does not pull in google.api_core.
+
+    Returns:
+        tuple: Exception classes from google.api_core.exceptions.
+    """
+    from google.api_core import exceptions as api_exceptions
+    return (
+        api_exceptions.TooManyRequests,
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.InternalServerError,
+        api_exceptions.DeadlineExceeded,
+    )
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class RateLimitExceededError(Exception):
+    """Raised when no rate-limit token became available within the allowed wait."""
+
+
+def is_retryable(error):
+    """
+    Check whether an exception from the Gemini API is worth retrying.
+
+    Args:
+        error (Exception): The raised exception.
+
+    Returns:
+        bool: True for quota, overload and transient server errors.
+    """
+    return isinstance(error, retryable_errors())
+
+
+class TokenBucket:
+    """
+    Client-side token bucket that spaces out requests to match the upstream quota.
+
+    Args:
+        rate_per_minute (float): Sustained number of requests allowed per minute.
+        burst (int): Maximum number of requests that may be sent back to back.
+    """
+
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # Take a token if one is available, else return the seconds until the next one
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, max_wait):
+        """
+        Block until a token is available.
+
+        Args:
+            max_wait (float): Longest time in seconds to wait for a token.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimitExceededError: If no token became available within `max_wait`.
+        """
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if delay == 0:
+                return waited
+            if waited + delay > max_wait:
+                raise RateLimitExceededError(f"Rate limit wait exceeded {max_wait:.0f}s")
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, max_wait):
+        """Asyncio variant of acquire that sleeps without blocking the loop."""
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if delay == 0:
+                return waited
+            if waited + delay > max_wait:
+                raise RateLimitExceededError(f"Rate limit wait exceeded {max_wait:.0f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the upstream is down.
+
+    After `failure_threshold` consecutive failed calls the breaker opens and rejects
+    calls for `reset_timeout` seconds. It then lets a single probe through
+    (half-open); a success closes it again, a failure re-opens it. A probe that ends
+    without an outcome (e.g. cancelled) is abandoned, and one still running after
+    another `reset_timeout` is presumed lost, so the breaker cannot stay half-open.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds to stay open before probing again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self):
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            bool: True if the call is the half-open probe.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a probe in flight.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.HALF_OPEN and (
+                not self._probe_in_flight or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_in_flight = True
+                self._probe_started = now
+                return True
+            self.rejected += 1
+        raise CircuitOpenError("Gemini API is temporarily unavailable; please try again shortly.")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def abandon_probe(self):
+        """Let another probe through after the current one ended without an outcome."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                    logger.warning("Gemini circuit breaker opened after %d failures", self._failures)
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class ResiliencePolicy:
+    """
+    Retry with jittered exponential backoff, client-side rate limiting and a
+    circuit breaker around calls to an upstream API.
+
+    Args:
+        requests_per_minute (float): Sustained request rate allowed by the quota.
+        burst (int): Requests that may be sent back to back.
+        max_retries (int): Retries after the first attempt for retryable errors.
+        backoff_base (float): Base delay in seconds for exponential backoff.
+        backoff_max (float): Upper bound for a single backoff delay.
+        max_queue_wait (float): Longest wait for a rate-limit token.
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open before probing.
+    """
+
+    def __init__(self, requests_per_minute=60, burst=10, max_retries=3, backoff_base=1.0,
+                 backoff_max=20.0, max_queue_wait=30.0, failure_threshold=5, reset_timeout=30.0):
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_queue_wait = max_queue_wait
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "successes": 0, "failures": 0, "retries": 0, "throttled_seconds": 0.0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _backoff(self, attempt):
+        # "Full jitter": uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _should_retry(self, error, attempt):
+        # Decide whether to retry `error`; records the outcome when giving up
+        if is_retryable(error) and attempt < self.max_retries:
+            self._count("retries")
+            logger.info("Retrying Gemini call after %s (attempt %d)", type(error).__name__, attempt + 1)
+            return True
+        self._give_up(error)
+        return False
+
+    def _give_up(self, error):
+        self._count("failures")
+        if is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # The upstream answered; the request itself was bad
+            self.breaker.record_success()
+
+    def _succeeded(self):
+        self._count("successes")
+        self.breaker.record_success()
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Call `fn(*args, **kwargs)` under the policy.
+
+        Raises:
+            RateLimitExceededError: If the rate limiter cannot admit the call in time.
+            CircuitOpenError: If the breaker rejects the call.
+            GoogleAPIError: The last upstream error once retries are exhausted.
+        """
+        self._count("calls")
+        self._count("throttled_seconds", self.bucket.acquire(self.max_queue_wait))
+        # Retries belong to the admitted call, so the breaker is only consulted once
+        probe = self.breaker.allow()
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                    time.sleep(self._backoff(attempt))
+                    attempt += 1
+                    try:
+                        self._count("throttled_seconds", self.bucket.acquire(self.max_queue_wait))
+                    except RateLimitExceededError:
+                        self._give_up(e)
+                        raise e
+                    continue
+                self._succeeded()
+                return result
+        except BaseException:
+            # Cancelled or interrupted mid-call: free the probe slot (no-op once an outcome is recorded)
+            if probe:
+                self.breaker.abandon_probe()
+            raise
+
+    async def call_async(self, fn, *args, **kwargs):
+        """Asyncio variant of call for coroutine functions."""
+        self._count("calls")
+        self._count("throttled_seconds", await self.bucket.acquire_async(self.max_queue_wait))
+        # Retries belong to the admitted call, so the breaker is only consulted once
+        probe = self.breaker.allow()
+        attempt = 0
+        try:
+            while True:
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+                    try:
+                        self._count("throttled_seconds", await self.bucket.acquire_async(self.max_queue_wait))
+                    except RateLimitExceededError:
+                        self._give_up(e)
+                        raise e
+                    continue
+                self._succeeded()
+                return result
+        except BaseException:
+            # Cancelled or interrupted mid-call: free the probe slot (no-op once an outcome is recorded)
+            if probe:
+                self.breaker.abandon_probe()
+            raise
+
+    def stats(self):
+        """
+        Snapshot of the policy's counters and breaker state.
+
+        Returns:
+            dict: Call/retry/failure counters, throttling time and circuit breaker state.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update(
+            circuit_state=self.breaker.state,
+            circuit_opened=self.breaker.opened,
+            circuit_rejected=self.breaker.rejected,
+        )
+        return stats
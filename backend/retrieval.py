@@ -0,0 +1,130 @@
+import time
+from collections import namedtuple
+import numpy as np
+from backend.search import tokenize
+
+# Packed prompt context plus what went into it and how long each stage took
+RetrievedContext = namedtuple(
+    "RetrievedContext", ["text", "passages", "tokens", "retrieval_ms", "packing_ms"]
+)
+
+# Rough prompt-size estimate, the same 4 characters per token used for progress bars
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """Approximate the number of model tokens in `text`."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class TfidfIndex:
+    """
+    Dense TF-IDF vectors over local passages, ranked by cosine similarity.
+
+    Rows use sublinear term frequency and smoothed idf and are L2-normalized, so
+    ranking a query is one matrix-vector product. The matrix is float32 and built
+    once; the index is read-only and can be shared by all sessions.
+
+    Args:
+        passages (list[Passage]): Content to index (see backend.search).
+    """
+
+    def __init__(self, passages):
+        self.passages = tuple(passages)
+        documents = [tokenize(f"{passage.title} {passage.text}") for passage in self.passages]
+        self.vocabulary = {}
+        for terms in documents:
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        counts = np.zeros((len(documents), len(self.vocabulary)), dtype=np.float32)
+        for row, terms in enumerate(documents):
+            for term in terms:
+                counts[row, self.vocabulary[term]] += 1
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        matrix = np.log1p(counts) * self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1, norms)
+
+    def __len__(self):
+        return len(self.passages)
+
+    def _vectorize(self, text):
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term in tokenize(text):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] += 1
+        vector = np.log1p(vector) * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def search(self, query, k=4, min_similarity=0.0):
+        """
+        Return the passages most similar to a query.
+
+        Args:
+            query (str): Free-text query.
+            k (int, optional): Maximum number of passages.
+            min_similarity (float, optional): Cosine similarity a passage must exceed.
+
+        Returns:
+            list[tuple[Passage, float]]: (passage, similarity) pairs, best first.
+        """
+        if not self.passages or k <= 0:
+            return []
+        scores = self.matrix @ self._vectorize(query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.passages[i], float(scores[i])) for i in top if scores[i] > min_similarity]
+
+
+def pack_passages(ranked, max_tokens):
+    """
+    Fill a token budget with ranked passages.
+
+    Passages are taken in rank order; one that does not fit is skipped so a shorter,
+    lower-ranked passage can still use the remaining budget.
+
+    Args:
+        ranked (list[tuple[Passage, float]]): Output of TfidfIndex.search.
+        max_tokens (int): Token budget for the packed text.
+
+    Returns:
+        tuple[str, list[Passage], int]: Packed text, passages used and estimated tokens.
+    """
+    blocks, used, tokens = [], [], 0
+    for passage, _ in ranked:
+        block = f"[{passage.source} — {passage.title}]\n{passage.text.strip()}"
+        cost = estimate_tokens(block)
+        if tokens + cost > max_tokens:
+            continue
+        blocks.append(block)
+        used.append(passage)
+        tokens += cost
+    return "\n\n".join(blocks), used, tokens
+
+
+def retrieve_context(index, query, k=4, max_tokens=1200, min_similarity=0.05):
+    """
+    Retrieve the passages relevant to a query and pack them under a token budget.
+
+    Args:
+        index (TfidfIndex): Index over the local content.
+        query (str): The user's question.
+        k (int, optional): Number of passages to consider.
+        max_tokens (int, optional): Token budget for the packed passages.
+        min_similarity (float, optional): Cosine similarity below which passages are ignored.
+
+    Returns:
+        RetrievedContext: Packed text (empty if nothing relevant), passages, tokens and stage timings.
+    """
+    start = time.perf_counter()
+    ranked = index.search(query, k=k, min_similarity=min_similarity)
+    retrieved = time.perf_counter()
+    text, used, tokens = pack_passages(ranked, max_tokens)
+    packed = time.perf_counter()
+    return RetrievedContext(text, used, tokens, (retrieved - start) * 1000, (packed - retrieved) * 1000)
@@ -0,0 +1,185 @@
+import math
+import re
+import textwrap
+import unicodedata
+from collections import Counter, namedtuple
+
+# A searchable unit of local content: where it came from, a display title and its markdown text
+Passage = namedtuple("Passage", ["source", "title", "text"])
+
+# A ranked match; coverage is the fraction of distinct query terms found in the passage
+SearchHit = namedtuple("SearchHit", ["passage", "score", "coverage"])
+
+# Word characters plus the whole Devanagari block except the danda/double danda (U+0964-U+0965).
+# \w alone would split words at vowel signs, viramas and nuktas, which are combining marks.
+_TOKEN = re.compile(r"[\w\u0900-\u0963\u0966-\u097F]+")
+
+# Zero-width joiners change how a conjunct is drawn, not which word it is
+_JOINERS = dict.fromkeys((0x200C, 0x200D))
+
+# Common English words that match almost every passage
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was were what "
+    "which who with about did does how tell me".split()
+)
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+_LEADING_SYMBOLS = re.compile(r"^[^\w(]+")
+
+
+def tokenize(text):
+    """
+    Split text into index terms.
+
+    Text is NFC-normalized (so precomposed and decomposed Devanagari spell the same
+    term), case-folded, stripped of zero-width joiners, and split on anything that is
+    not a word character or a Devanagari letter or sign. Markdown markup and emoji
+    therefore never become terms. English stopwords and single characters are dropped.
+
+    Args:
+        text (str): Text in English, Hindi or Sanskrit (Devanagari).
+
+    Returns:
+        list[str]: Terms in order of appearance.
+    """
+    text = unicodedata.normalize("NFC", text).casefold().translate(_JOINERS)
+    return [
+        term for term in _TOKEN.findall(text)
+        if len(term) > 1 and term not in STOPWORDS and term.strip("_")
+    ]
+
+
+def _plain_title(heading):
+    # Heading text without markdown emphasis or leading emoji
+    title = heading.replace("*", "").strip()
+    return _LEADING_SYMBOLS.sub("", title) or title
+
+
+def markdown_passages(source, markdown):
+    """
+    Split a markdown document into one passage per heading section.
+
+    Args:
+        source (str): Label of the document, e.g. the era name.
+        markdown (str): Document text; sections start at `#` headings.
+
+    Returns:
+        list[Passage]: Non-empty sections in document order.
+    """
+    markdown = textwrap.dedent(markdown)
+    starts = [match.start() for match in _HEADING.finditer(markdown)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    passages = []
+    for begin, end in zip(starts, starts[1:] + [len(markdown)]):
+        section = markdown[begin:end].strip().strip("-").strip()
+        if not section:
+            continue
+        heading = _HEADING.match(section)
+        title = _plain_title(heading.group(1)) if heading else _plain_title(source)
+        body = section[heading.end():].strip() if heading else section
+        if body:
+            passages.append(Passage(source, title, body))
+    return passages
+
+
+def knowledge_base_passages(knowledge_base):
+    """
+    Turn every category, text and mandal of the knowledge base into passages.
+
+    Args:
+        knowledge_base (KnowledgeBase): The loaded knowledge base.
+
+    Returns:
+        list[Passage]: One passage per category description, text and mandal.
+    """
+    passages = []
+    for name in knowledge_base.categories():
+        category = knowledge_base.category(name)
+        passages.append(Passage(name, name, category.description))
+        for text in category.texts:
+            passages.append(Passage(name, text.title, text.content))
+            for mandal in text.mandals:
+                passages.append(Passage(name, f"{text.title} — Mandal {mandal.number}", mandal.description))
+    return passages
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 ranking.
+
+    Postings map each term to (passage id, term frequency) pairs, so a query only
+    touches passages that contain at least one of its terms. The index is built once
+    and never mutated, so it can be shared by all sessions (st.cache_resource).
+
+    Args:
+        passages (list[Passage]): Content to index.
+        k1 (float, optional): Term-frequency saturation.
+        b (float, optional): Document-length normalization.
+    """
+
+    def __init__(self, passages, k1=1.5, b=0.75):
+        self.passages = tuple(passages)
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._lengths = []
+        for doc_id, passage in enumerate(self.passages):
+            terms = tokenize(f"{passage.title} {passage.text}")
+            self._lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self._postings.setdefault(term, []).append((doc_id, count))
+        total = len(self.passages)
+        self._average_length = (sum(self._lengths) / total) if total else 0.0
+        # Lucene-style idf: always positive, so terms found in most passages still count a little
+        self._idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def __len__(self):
+        return len(self.passages)
+
+    def search(self, query, k=5):
+        """
+        Rank passages against a query.
+
+        Args:
+            query (str): Free-text query.
+            k (int, optional): Maximum number of hits.
+
+        Returns:
+            list[SearchHit]: Best matches first; empty if no query term is indexed.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        scores = Counter()
+        matched = Counter()
+        for term in terms:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, count in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._average_length)
+                scores[doc_id] += idf * count * (self.k1 + 1) / (count + norm)
+                matched[doc_id] += 1
+        return [
+            SearchHit(self.passages[doc_id], score, matched[doc_id] / len(terms))
+            for doc_id, score in scores.most_common(k)
+        ]
+
+
+def is_confident(hits, min_score=2.0, min_coverage=0.5):
+    """
+    Decide whether local results answer the query or the LLM should be asked.
+
+    Args:
+        hits (list[SearchHit]): Results from BM25Index.search.
+        min_score (float, optional): Minimum BM25 score of the best hit.
+        min_coverage (float, optional): Minimum share of query terms the best hit contains.
+
+    Returns:
+        bool: True if the best hit clears both thresholds.
+    """
+    return bool(hits) and hits[0].score >= min_score and hits[0].coverage >= min_coverage
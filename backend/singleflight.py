@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    # One in-flight call and the outcome its followers wait for
+    __slots__ = ("done", "result", "error", "abandoned")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls across threads.
+
+    The first caller for a key (the leader) runs the function; callers arriving with
+    the same key while it is in flight wait and receive the same result or exception.
+    If the leader is interrupted by a BaseException (such as Streamlit's rerun or stop
+    signals), the followers are woken and one of them runs the call instead.
+    Once the call returns the key is released, so later calls run again (by then the
+    response cache normally answers them).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` once per key among concurrent callers.
+
+        Args:
+            key (str): Identity of the call; equal keys share one execution.
+            fn (callable): The function to run.
+
+        Returns:
+            The result of the shared call.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.leaders += 1
+                else:
+                    self.followers += 1
+
+            if not leader:
+                call.done.wait()
+                if call.abandoned:
+                    continue  # The leader was interrupted; retry, possibly as the new leader
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            try:
+                call.result = fn(*args, **kwargs)
+            except Exception as e:
+                call.error = e
+                raise
+            except BaseException:
+                # Not an outcome of the call (e.g. a Streamlit rerun of the leader's session),
+                # so it is not handed to followers from other sessions
+                call.abandoned = True
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+    def stats(self):
+        """Return how many calls ran upstream (leaders) and how many were coalesced (followers)."""
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce identical concurrent coroutines on one event loop.
+
+    Not thread-safe: every call must run on the same loop (the Gemini background loop).
+    Each caller awaits a shielded view of the shared task, so a cancelled caller does
+    not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key, coro_fn, *args):
+        """
+        Await `coro_fn(*args)` once per key among concurrent callers.
+
+        Returns:
+            The result of the shared coroutine.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn(*args))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """Return leader, follower and in-flight counts."""
+        return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._tasks)}
+
+
+class _Broadcast:
+    # Chunks of one stream, replayed to every subscriber from the start
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._chunks = []
+        self._finished = False
+
+    def publish(self, chunk):
+        with self._cond:
+            self._chunks.append(chunk)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def subscribe(self):
+        position = 0
+        while True:
+            with self._cond:
+                while position >= len(self._chunks) and not self._finished:
+                    self._cond.wait()
+                chunks = self._chunks[position:]
+                finished = self._finished
+            position += len(chunks)
+            yield from chunks
+            if finished:
+                return
+
+
+class StreamFlight:
+    """
+    Share one streamed upstream call among concurrent identical requests.
+
+    The stream is produced on its own thread and every subscriber, including the one
+    that started it, reads the chunks from a shared buffer: late joiners first get what
+    was already produced, then the rest live. A subscriber that stops reading (e.g. a
+    Streamlit rerun) does not stall the others, and the stream still runs to completion.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _run(self, key, broadcast, produce, args, ticket):
+        try:
+            for chunk in produce(*args):
+                broadcast.publish(chunk)
+        except Exception:
+            logger.exception("Shared stream failed")
+        finally:
+            if ticket is not None:
+                ticket.release()
+            with self._lock:
+                del self._flights[key]
+            broadcast.close()
+
+    def subscribe(self, key, produce, *args, admit=None):
+        """
+        Iterate the shared stream for `key`, starting `produce(*args)` if none is running.
+
+        Args:
+            key (str): Identity of the stream; equal keys share one upstream call.
+            produce (callable): Generator function yielding the stream's chunks.
+            admit (callable, optional): Called on the subscriber's thread before a new
+                stream is started (never when joining one); returns a ticket that is
+                released when the stream ends, and may block or raise to refuse.
+
+        Yields:
+            The stream's chunks, from the first one.
+        """
+        with self._lock:
+            running = key in self._flights
+        ticket = admit() if admit is not None and not running else None
+        with self._lock:
+            broadcast = self._flights.get(key)
+            if broadcast is None:
+                broadcast = self._flights[key] = _Broadcast()
+                self.leaders += 1
+                threading.Thread(
+                    target=self._run, args=(key, broadcast, produce, args, ticket), name="gemini-stream", daemon=True
+                ).start()
+                ticket = None
+            else:
+                self.followers += 1
+        if ticket is not None:
+            # Another subscriber started the same stream while this one was being admitted
+            ticket.release()
+        yield from broadcast.subscribe()
+
+    def stats(self):
+        """Return leader, follower and in-flight counts."""
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._flights)}
@@ -0,0 +1,173 @@
+import functools
+import shutil
+import subprocess
+from io import BytesIO
+import streamlit as st
+
+# UI language names mapped to ISO 639-1 codes understood by both engines
+LANGUAGE_CODES = {
+    "English": "en",
+    "Hindi": "hi",
+    "Odia": "or",
+    "Bengali": "bn",
+    "Tamil": "ta",
+    "Telugu": "te",
+    "Marathi": "mr",
+    "Kannada": "kn",
+    "Gujarati": "gu",
+    "Punjabi": "pa",
+}
+
+
+class TTSBackend:
+    """
+    Interface for text-to-speech engines.
+
+    Subclasses set `name` and `mime` and implement `supports` and `synthesize`.
+    `cache_id` must change whenever the same text would produce different audio.
+    """
+
+    name = "base"
+    mime = "audio/mp3"
+
+    @property
+    def cache_id(self):
+        return self.name
+
+    def supports(self, lang):
+        """Return True if the engine can speak the ISO 639-1 language `lang`."""
+        raise NotImplementedError
+
+    def synthesize(self, text, lang):
+        """
+        Convert text to speech.
+
+        Args:
+            text (str): Cleaned text to speak.
+            lang (str): ISO 639-1 language code.
+
+        Returns:
+            bytes: Encoded audio in the backend's `mime` format.
+        """
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """
+    Google Translate TTS over HTTP (needs network access).
+
+    Args:
+        tld (str, optional): Google Translate top-level domain, which selects the accent.
+    """
+
+    name = "gtts"
+    mime = "audio/mp3"
+
+    def __init__(self, tld='co.in'):
+        self.tld = tld
+
+    @property
+    def cache_id(self):
+        return f"gtts:{self.tld}"
+
+    def supports(self, lang):
+        # Imported on first use to keep gTTS off the cold-start path
+        from gtts.lang import tts_langs
+        return lang in tts_langs()
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+
+        audio_file = BytesIO()
+        gTTS(text, lang=lang, tld=self.tld).write_to_fp(audio_file)
+        return audio_file.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Local, offline synthesis with the espeak-ng command line tool (WAV output).
+
+    Args:
+        executable (str, optional): espeak-ng binary; found on PATH when omitted.
+        speed (int, optional): Words per minute.
+    """
+
+    name = "espeak"
+    mime = "audio/wav"
+
+    def __init__(self, executable=None, speed=160):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.speed = speed
+
+    @property
+    def cache_id(self):
+        return f"espeak:{self.speed}"
+
+    @functools.cached_property
+    def voices(self):
+        # Language codes of the installed voices, read once from `espeak-ng --voices`
+        if not self.executable:
+            return frozenset()
+        result = subprocess.run([self.executable, "--voices"], capture_output=True, text=True, timeout=10)
+        return frozenset(line.split()[1] for line in result.stdout.splitlines()[1:] if len(line.split()) > 1)
+
+    def supports(self, lang):
+        return any(voice == lang or voice.startswith(lang + "-") for voice in self.voices)
+
+    def synthesize(self, text, lang):
+        if not self.executable:
+            raise RuntimeError("espeak-ng not found: install it or set [tts] espeak_path in secrets")
+        # Text goes through stdin so long responses are not limited by argv size
+        result = subprocess.run(
+            [self.executable, "-v", lang, "-s", str(self.speed), "--stdout"],
+            input=text.encode("utf-8"), capture_output=True, timeout=60, check=True,
+        )
+        return result.stdout
+
+
+@functools.lru_cache(maxsize=None)
+def _backends():
+    settings = st.secrets.get("tts", {})
+    return {
+        "gtts": GTTSBackend(tld=settings.get("gtts_tld", "co.in")),
+        "espeak": EspeakBackend(executable=settings.get("espeak_path") or None, speed=int(settings.get("espeak_speed", 160))),
+    }
+
+
+def register_backend(name, backend):
+    """
+    Add or replace a TTS engine, selectable by `name` like the built-in ones
+    (e.g. a silent stub so load tests make no network calls).
+
+    Args:
+        name (str): Engine name used in [tts] settings and `get_backend`.
+        backend (TTSBackend): The engine.
+    """
+    _backends()[name] = backend
+
+
+def get_backend(lang, name=None):
+    """
+    Pick the TTS engine for a language.
+
+    The engine is `name` if given, else the per-language choice from the [tts.languages]
+    secrets table, else [tts] default_backend (gTTS unless configured). If that engine
+    cannot speak `lang`, any other engine that can is used instead.
+
+    Args:
+        lang (str): ISO 639-1 language code.
+        name (str, optional): Preferred engine ("gtts" or "espeak").
+
+    Returns:
+        TTSBackend: The engine to use (the preferred one if no engine supports `lang`).
+    """
+    settings = st.secrets.get("tts", {})
+    backends = _backends()
+    name = name or settings.get("languages", {}).get(lang) or settings.get("default_backend", "gtts")
+    preferred = backends[name]
+    if preferred.supports(lang):
+        return preferred
+    for backend in backends.values():
+        if backend is not preferred and backend.supports(lang):
+            return backend
+    return preferred
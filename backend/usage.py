@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# Request attributes that usage is broken down by; callers pass them as `tags`
+USAGE_DIMENSIONS = ("page", "mode", "tone", "language")
+
+
+def usage_from_response(response):
+    """
+    Extract token counts and the finish reason from a Gemini response or final stream chunk.
+
+    Args:
+        response: GenerateContentResponse (or chunk); missing fields count as 0 / None.
+
+    Returns:
+        dict: prompt_tokens, output_tokens, total_tokens, cached_tokens (the part of the
+        prompt served from cached content) and finish_reason.
+    """
+    metadata = getattr(response, "usage_metadata", None)
+
+    def count(name):
+        value = getattr(metadata, name, 0) if metadata is not None else 0
+        return value if isinstance(value, int) else 0
+
+    finish_reason = None
+    candidates = getattr(response, "candidates", None) or ()
+    if candidates:
+        reason = getattr(candidates[0], "finish_reason", None)
+        name = getattr(reason, "name", reason)
+        finish_reason = name if isinstance(name, str) else None
+    prompt_tokens = count("prompt_token_count")
+    output_tokens = count("candidates_token_count")
+    return {
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": count("total_token_count") or prompt_tokens + output_tokens,
+        "cached_tokens": count("cached_content_token_count"),
+        "finish_reason": finish_reason,
+    }
+
+
+class UsageLedger:
+    """
+    Per-request token accounting for upstream Gemini calls.
+
+    Each call is appended as one JSON line to `log_path` (when set), so usage survives
+    restarts and can be read by admin.py from any process, and is also aggregated
+    in memory per (page, mode, tone, language). Cache hits and coalesced followers
+    never reach the model and are not recorded.
+
+    Args:
+        log_path (str, optional): JSONL file to append to; empty to keep usage in memory only.
+    """
+
+    def __init__(self, log_path=""):
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._totals = {}
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+    def record(self, tags, model, usage, seconds):
+        """
+        Account for one upstream call.
+
+        Args:
+            tags (dict): Request attributes (see USAGE_DIMENSIONS); missing ones are "".
+            model (str): Model name.
+            usage (dict): Output of usage_from_response.
+            seconds (float): Wall time of the call, used for tokens/second.
+        """
+        tags = tags or {}
+        entry = {"ts": time.time(), "model": model, "seconds": round(seconds, 4)}
+        entry.update({dimension: str(tags.get(dimension, "")) for dimension in USAGE_DIMENSIONS})
+        entry.update(usage)
+        group = tuple(entry[dimension] for dimension in USAGE_DIMENSIONS)
+        with self._lock:
+            totals = self._totals.setdefault(group, _empty_totals())
+            _add(totals, entry)
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError:
+                    pass  # Accounting must never break a request
+
+    def totals(self):
+        """
+        In-process aggregates since start.
+
+        Returns:
+            dict: (page, mode, tone, language) -> totals (see aggregate_usage).
+        """
+        with self._lock:
+            return {group: dict(totals, finish_reasons=dict(totals["finish_reasons"])) for group, totals in self._totals.items()}
+
+
+def _empty_totals():
+    return {
+        "requests": 0, "prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cached_tokens": 0,
+        "seconds": 0.0, "finish_reasons": Counter(),
+    }
+
+
+def _add(totals, entry):
+    totals["requests"] += 1
+    for field in ("prompt_tokens", "output_tokens", "total_tokens", "cached_tokens", "seconds"):
+        totals[field] += entry.get(field) or 0
+    totals["finish_reasons"][entry.get("finish_reason") or "UNKNOWN"] += 1
+
+
+def read_usage_log(path, since=None):
+    """
+    Load usage entries from a JSONL log, skipping malformed lines.
+
+    Args:
+        path (str): Log written by UsageLedger.
+        since (float, optional): Only entries with a timestamp at or after this epoch time.
+
+    Returns:
+        list[dict]: Entries in file order (empty if the file does not exist).
+    """
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if since is None or entry.get("ts", 0) >= since:
+                entries.append(entry)
+    return entries
+
+
+def aggregate_usage(entries, by=USAGE_DIMENSIONS):
+    """
+    Sum token usage per group and derive averages and throughput.
+
+    Args:
+        entries (list[dict]): Usage entries.
+        by (tuple[str], optional): Fields to group by, e.g. ("page",) or ("page", "mode").
+
+    Returns:
+        list[dict]: One row per group with the group fields plus requests, prompt_tokens,
+        output_tokens, total_tokens, cached_tokens, avg_prompt_tokens, avg_output_tokens,
+        output_tokens_per_second, seconds and finish_reasons; largest total_tokens first.
+    """
+    groups = {}
+    for entry in entries:
+        group = tuple(entry.get(field, "") for field in by)
+        _add(groups.setdefault(group, _empty_totals()), entry)
+    rows = []
+    for group, totals in groups.items():
+        row = dict(zip(by, group))
+        requests = totals["requests"]
+        row.update(
+            requests=requests,
+            prompt_tokens=totals["prompt_tokens"],
+            output_tokens=totals["output_tokens"],
+            total_tokens=totals["total_tokens"],
+            cached_tokens=totals["cached_tokens"],
+            avg_prompt_tokens=totals["prompt_tokens"] / requests,
+            avg_output_tokens=totals["output_tokens"] / requests,
+            output_tokens_per_second=totals["output_tokens"] / totals["seconds"] if totals["seconds"] else 0.0,
+            seconds=totals["seconds"],
+            finish_reasons=dict(totals["finish_reasons"]),
+        )
+        rows.append(row)
+    return sorted(rows, key=lambda row: -row["total_tokens"])
@@ -0,0 +1,90 @@
+"""
+Per-rerun cost of serving the knowledge base as the dataset grows.
+
+st.cache_data stores a pickle and returns a fresh unpickled copy on every call,
+so each rerun of each session pays a deep copy. st.cache_resource hands back the
+same shared object. This script measures both for synthetic knowledge bases of
+increasing size, along with the memory allocated per rerun and the one-time
+footprint of the shared instance.
+
+Usage:
+    python benchmarks/bench_knowledge_base.py [--sizes 50 500 5000]
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.knowledge_base import KnowledgeBase  # noqa: E402
+
+
+def synthetic_data(texts, mandals_per_text=10, categories=10):
+    """Build a data-file dict with `texts` texts spread over `categories` categories."""
+    per_category = max(1, texts // categories)
+    return {
+        "version": 1,
+        "categories": [
+            {
+                "name": f"Category {c}",
+                "description": "A knowledge area description of typical length. " * 4,
+                "examples": [
+                    {
+                        "title": f"Text {c}.{t}",
+                        "content": "A summary of the text, its themes and its significance. " * 3,
+                        "mandals": [
+                            {"number": m + 1, "description": "Hymns dedicated to the deities of nature."}
+                            for m in range(mandals_per_text)
+                        ],
+                    }
+                    for t in range(per_category)
+                ],
+            }
+            for c in range(categories)
+        ],
+    }
+
+
+def per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def retained_kib(fn):
+    tracemalloc.start()
+    value = fn()  # noqa: F841  (kept alive while measuring)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'texts':>6} {'cache_data ms':>14} {'KiB/rerun':>10} {'cache_resource ms':>18} {'KiB/rerun':>10} {'shared KiB':>11}")
+    for size in args.sizes:
+        data = synthetic_data(size)
+
+        # Old path: a dict served by st.cache_data, unpickled on every rerun
+        dict_blob = pickle.dumps(data)
+        data_ms = per_call_ms(lambda: pickle.loads(dict_blob), args.repeat)
+        data_kib = retained_kib(lambda: pickle.loads(dict_blob))
+
+        # New path: one shared immutable KnowledgeBase served by st.cache_resource
+        shared = KnowledgeBase(data)
+        resource_ms = per_call_ms(lambda: shared, args.repeat)
+        shared_kib = retained_kib(lambda: KnowledgeBase(data))
+
+        print(f"{size:>6} {data_ms:>14.3f} {data_kib:>10.1f} {resource_ms:>18.5f} {0.0:>10.1f} {shared_kib:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
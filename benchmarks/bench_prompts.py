@@ -0,0 +1,64 @@
+"""
+Micro-benchmark for backend.langchain.generate_prompt.
+
+Compares the per-call cost of the compiled template registry with the previous
+approach of building a LangChain PromptTemplate (strip + validation) on every request.
+
+Usage:
+    python benchmarks/bench_prompts.py [--calls 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.langchain import TEMPLATES_BY_MODE, generate_prompt  # noqa: E402
+
+CASES = [
+    ("love", "hindi", "poetry", "romantic"),
+    ("nature", "english", "prose", "serene"),
+    ("freedom", "odia", "narrative", "inspirational"),
+    ("time", "tamil", "philosophical", "contemplative"),
+]
+
+
+def legacy_generate_prompt(query, language, mode, tone):
+    # Per-call PromptTemplate construction, as generate_prompt did before the registry
+    try:
+        from langchain.prompts import PromptTemplate
+    except ImportError:
+        from langchain_core.prompts import PromptTemplate
+    templates = TEMPLATES_BY_MODE.get(mode, TEMPLATES_BY_MODE["prose"])
+    template = templates.get(tone, templates["neutral"])
+    prompt = PromptTemplate(input_variables=["query", "language", "mode", "tone"], template=template.strip())
+    return prompt.format(query=query, language=language, mode=mode, tone=tone)
+
+
+def bench(fn, calls):
+    def run():
+        for case in CASES:
+            fn(*case)
+    seconds = min(timeit.repeat(run, number=calls // len(CASES), repeat=3))
+    return seconds / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    registry_us = bench(generate_prompt, args.calls)
+    print(f"registry : {registry_us:8.2f} us/call")
+    try:
+        legacy_us = bench(legacy_generate_prompt, max(len(CASES), args.calls // 10))
+    except ImportError:
+        print("legacy   : skipped (langchain is not installed)")
+        return
+    print(f"legacy   : {legacy_us:8.2f} us/call")
+    print(f"speedup  : {legacy_us / registry_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Build time and query latency of the local BM25 index used by "Search History".
+
+Indexes the knowledge base plus the era histories in content/history and times a set of typical queries, reporting whether each one
+would be answered locally or sent to Gemini.
+
+Usage:
+    python benchmarks/bench_search.py [--repeat 200] [--queries "Bhakti Movement" ...]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.history import load_era_index, read_era  # noqa: E402
+from backend.knowledge_base import KnowledgeBase  # noqa: E402
+from backend.search import BM25Index, is_confident, knowledge_base_passages, markdown_passages  # noqa: E402
+
+QUERIES = [
+    "Contributions of Aryabhata",
+    "Bhakti Movement",
+    "What is dharma?",
+    "Ashoka edicts",
+    "Chandrayaan moon landing",
+    "वेद",
+    "quantum computing",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--queries", nargs="+", default=QUERIES)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    passages = knowledge_base_passages(KnowledgeBase.load())
+    for label, era in load_era_index().items():
+        passages.extend(markdown_passages(label, read_era(era)))
+    index = BM25Index(passages)
+    print(f"indexed {len(index)} passages in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'query':<30} {'mean ms':>8} {'max ms':>8} {'score':>7}  answered by")
+    for query in args.queries:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = index.search(query, k=3)
+            timings.append((time.perf_counter() - start) * 1000)
+        score = hits[0].score if hits else 0.0
+        print(f"{query[:30]:<30} {statistics.mean(timings):8.3f} {max(timings):8.3f} {score:7.2f}  "
+              f"{'local index' if is_confident(hits) else 'Gemini'}")
+
+
+if __name__ == "__main__":
+    main()
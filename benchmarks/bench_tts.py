@@ -0,0 +1,65 @@
+"""
+Latency benchmark for the text-to-speech engines in backend/tts.py.
+
+Synthesizes the same sentences with every engine that supports each language,
+bypassing the audio cache, and reports mean/p95 latency and output size.
+
+Usage:
+    python benchmarks/bench_tts.py [--runs 5] [--languages en hi or]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.tts import EspeakBackend, GTTSBackend  # noqa: E402
+
+SAMPLES = {
+    "en": "The river remembers every stone it has passed. Listen, and it will tell you their names.",
+    "hi": "नदी हर उस पत्थर को याद रखती है जिससे वह गुज़री है। सुनो, वह तुम्हें उनके नाम बताएगी।",
+    "or": "ନଦୀ ପ୍ରତ୍ୟେକ ପଥରକୁ ମନେ ରଖେ ଯାହା ଦେଇ ସେ ଯାଇଛି।",
+    "ta": "நதி தான் கடந்த ஒவ்வொரு கல்லையும் நினைவில் வைத்திருக்கிறது.",
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--languages", nargs="+", default=list(SAMPLES))
+    args = parser.parse_args()
+
+    backends = [GTTSBackend(), EspeakBackend()]
+    print(f"{'engine':<8} {'lang':<5} {'mean ms':>9} {'p95 ms':>9} {'bytes':>9}")
+    for lang in args.languages:
+        text = SAMPLES.get(lang, SAMPLES["en"])
+        for backend in backends:
+            try:
+                supported = backend.supports(lang)
+            except ImportError:
+                supported = False
+            if not supported:
+                print(f"{backend.name:<8} {lang:<5} {'unsupported or not installed':>29}")
+                continue
+            timings = []
+            size = 0
+            try:
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    size = len(backend.synthesize(text, lang))
+                    timings.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                print(f"{backend.name:<8} {lang:<5} failed: {e}")
+                continue
+            print(f"{backend.name:<8} {lang:<5} {statistics.mean(timings):9.1f} {percentile(timings, 0.95):9.1f} {size:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Local stand-ins for Gemini and the TTS engine, for load tests that must not spend quota.
+
+Imported by benchmarks/load_test.py, which puts the repository root on sys.path.
+
+FakeGemini builds models (via backend.gemini_api.set_model_factory) that answer with
+lorem-style text after a sampled time to first token, stream it in chunks at a fixed
+rate, report token usage like the real API, and fail a configurable share of calls with
+the same transient errors the resilience policy retries. SilentTTSBackend returns a
+tiny audio payload after a fixed delay (register it with backend.tts.register_backend).
+
+Latency specs (seconds):
+    "0.8"                 fixed
+    "uniform:0.3,1.5"     uniform between the bounds
+    "lognormal:0.8,0.5"   log-normal with the given median and sigma (long tail)
+"""
+import asyncio
+import math
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.tts import TTSBackend
+
+WORDS = (
+    "the river remembers every season of rain and the hills keep the old songs of the morning "
+    "light while the seeker walks on with patience and the lamp of knowledge burns steady"
+).split()
+
+
+def parse_latency(spec):
+    """
+    Turn a latency spec into a sampler.
+
+    Args:
+        spec (str): "0.8", "uniform:low,high" or "lognormal:median,sigma".
+
+    Returns:
+        callable: Takes a random.Random and returns a delay in seconds.
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+    values = [float(value) for value in params.split(",")]
+    if kind == "uniform":
+        low, high = values
+        return lambda rng: rng.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+def _response(text, prompt_tokens=0, output_tokens=0, finish_reason=None):
+    # Mimics the attributes of GenerateContentResponse that the backend reads
+    candidate = SimpleNamespace(
+        content=SimpleNamespace(parts=[SimpleNamespace(text=text)]),
+        finish_reason=SimpleNamespace(name=finish_reason) if finish_reason else None,
+    )
+    usage = SimpleNamespace(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens,
+        total_token_count=prompt_tokens + output_tokens,
+    )
+    return SimpleNamespace(candidates=[candidate], usage_metadata=usage)
+
+
+class FakeGemini:
+    """
+    Model factory and call statistics for a stubbed Gemini upstream.
+
+    Args:
+        first_token (str, optional): Latency spec for the time to first token.
+        output_tokens (int, optional): Tokens per answer (about 4 characters each).
+        chunks (int, optional): Chunks a streamed answer is split into.
+        tokens_per_second (float, optional): Streaming rate after the first chunk.
+        error_rate (float, optional): Share of calls failing with ServiceUnavailable.
+        seed (int, optional): Seed for latencies and errors, for repeatable runs.
+    """
+
+    def __init__(self, first_token="0.8", output_tokens=400, chunks=8, tokens_per_second=80.0, error_rate=0.0, seed=7):
+        self.first_token = parse_latency(first_token)
+        self.output_tokens = output_tokens
+        self.chunks = max(1, chunks)
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def __call__(self, model_name, system_instruction=None, generation_config=None):
+        return _FakeModel(self, system_instruction)
+
+    def _plan(self):
+        # Sample one call: its first-token delay and whether it fails
+        with self._lock:
+            self.calls += 1
+            delay = self.first_token(self._rng)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def _answer(self, contents):
+        prompt = contents if isinstance(contents, str) else str(contents[0])
+        words = [WORDS[i % len(WORDS)] for i in range(len(prompt), len(prompt) + self.output_tokens)]
+        sentences = [" ".join(words[i:i + 12]).capitalize() + "." for i in range(0, len(words), 12)]
+        return " ".join(sentences), max(1, len(prompt) // 4)
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "errors": self.errors}
+
+
+def _unavailable():
+    from google.api_core.exceptions import ServiceUnavailable
+    return ServiceUnavailable("Injected failure from the fake Gemini upstream")
+
+
+class _FakeModel:
+    def __init__(self, upstream, system_instruction):
+        self._upstream = upstream
+        self._system_instruction = system_instruction or ""
+
+    def generate_content(self, contents, stream=False):
+        delay, failed = self._upstream._plan()
+        time.sleep(delay)
+        if failed:
+            raise _unavailable()
+        text, prompt_tokens = self._upstream._answer(contents)
+        prompt_tokens += len(self._system_instruction) // 4
+        if not stream:
+            time.sleep(self._upstream.output_tokens / self._upstream.tokens_per_second)
+            return _response(text, prompt_tokens, self._upstream.output_tokens, "STOP")
+        return self._stream(text, prompt_tokens)
+
+    def _stream(self, text, prompt_tokens):
+        upstream = self._upstream
+        size = math.ceil(len(text) / upstream.chunks)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        interval = upstream.output_tokens / upstream.tokens_per_second / len(pieces)
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(interval)
+            last = i == len(pieces) - 1
+            # Like the API, only the final chunk carries the totals and the finish reason
+            yield _response(piece, prompt_tokens if last else 0, upstream.output_tokens if last else 0,
+                            "STOP" if last else None)
+
+    async def generate_content_async(self, contents):
+        delay, failed = self._upstream._plan()
+        await asyncio.sleep(delay + self._upstream.output_tokens / self._upstream.tokens_per_second)
+        if failed:
+            raise _unavailable()
+        text, prompt_tokens = self._upstream._answer(contents)
+        return _response(text, prompt_tokens, self._upstream.output_tokens, "STOP")
+
+
+class SilentTTSBackend(TTSBackend):
+    """
+    TTS engine stub: a few bytes of "audio" after a fixed delay, for every language.
+
+    Args:
+        delay (float, optional): Seconds per synthesized segment.
+    """
+
+    name = "silent"
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+
+    def supports(self, lang):
+        return True
+
+    def synthesize(self, text, lang):
+        time.sleep(self.delay)
+        return b"ID3" + text[:16].encode("utf-8")
@@ -0,0 +1,84 @@
+"""
+Import-time report for the app's modules and their heavy dependencies.
+
+Each target is imported in a fresh interpreter with `python -X importtime`, after
+pre-importing streamlit (already loaded in a running Streamlit server), and the
+cumulative milliseconds of the target plus its heaviest sub-imports are printed.
+
+Usage:
+    python benchmarks/import_report.py [--top 5] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    "backend.gemini_api",
+    "backend.langchain",
+    "backend.cache",
+    "backend.resilience",
+    "google.generativeai",
+    "gtts",
+]
+
+
+def measure(module, preload="streamlit"):
+    """
+    Import `module` in a subprocess and parse its -X importtime output.
+
+    Args:
+        module (str): Dotted module name to import.
+        preload (str, optional): Module imported first and excluded from the report.
+
+    Returns:
+        list[tuple[str, float, float]]: (module, self_ms, cumulative_ms) for every module
+        newly imported by `module`, in import order.
+    """
+    code = f"import {preload}; import {module}" if preload else f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # Header line
+        rows.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    # Only keep what was imported after the preload finished
+    if preload:
+        done = next((i for i, row in enumerate(rows) if row[0] == preload), -1)
+        rows = rows[done + 1:]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--top", type=int, default=5, help="heaviest sub-imports to list per target")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            rows = measure(module)
+        except RuntimeError as e:
+            print(f"{module:<32} failed: {e}")
+            continue
+        total = next((cumulative for name, _, cumulative in rows if name == module), 0.0)
+        print(f"{module:<32} {total:9.1f} ms")
+        children = sorted((row for row in rows if row[0] != module), key=lambda row: row[1], reverse=True)
+        for name, self_ms, _ in children[:args.top]:
+            print(f"    {name:<40} {self_ms:7.1f} ms self")
+
+
+if __name__ == "__main__":
+    main()
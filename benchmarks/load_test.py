@@ -0,0 +1,299 @@
+"""
+Load test app.py and veda.py with simulated concurrent users and a local fake Gemini.
+
+Each simulated session drives one app through Streamlit's AppTest the way a user would
+(open the page, type a query, press the button, ...), timing every rerun. Sessions run
+on a thread pool in this one process, so they share the response cache, request
+coalescing, admission queue and st.cache_resource objects exactly as sessions of a
+Streamlit server do. Gemini is replaced by benchmarks/fake_gemini.py through
+backend.gemini_api.set_model_factory and speech by a silent TTS stub, so no quota or
+network is used.
+
+Reported: session and rerun throughput, rerun latency percentiles per step, fake
+upstream calls and injected errors, cache/coalescing/admission counters, and memory.
+With --max-p95 the script exits non-zero when any step is slower, for use as a
+pre-deploy check.
+
+Usage:
+    python benchmarks/load_test.py [--app both] [--sessions 40] [--concurrency 8]
+        [--first-token lognormal:0.8,0.5] [--tokens-per-second 80] [--chunks 8]
+        [--error-rate 0.05] [--distinct-queries 10] [--json report.json] [--max-p95 5]
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.logger import set_log_level  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import app_test  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+from backend import gemini_api  # noqa: E402
+from backend.tts import register_backend  # noqa: E402
+from fake_gemini import FakeGemini, SilentTTSBackend  # noqa: E402
+
+# Session id of the simulated user on the current worker thread
+_current = threading.local()
+
+# Compiled app scripts, shared by all sessions as on a server (compiling the same
+# script on several threads at once also trips a CPython 3.11 AST bug)
+_script_cache = ScriptCache()
+
+APP_TOPICS = ["love", "monsoon rain", "friendship", "the sea at dawn", "a mother's hands", "city lights"]
+VEDA_QUESTIONS = ["What is karma?", "What is dharma?", "Why meditate?", "What are the Upanishads?"]
+HISTORY_QUERIES = ["Maurya trade routes", "Temple architecture of the Cholas", "Mughal miniature painting"]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def rss_mb():
+    # Peak resident set size of this process (kilobytes on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def prepare_environment(args):
+    """
+    Make concurrent AppTest runs safe and point the backend at the stubs.
+
+    AppTest swaps st.secrets, the Runtime singleton and a config option around every
+    run, which is fine for sequential tests but races between threads. Here the secrets
+    and the runtime are installed once for the whole process and AppTest is left with a
+    private Runtime subclass to swap, so concurrent sessions never see them disappear.
+    """
+    secrets = Secrets()
+    secrets._secrets = {
+        "api_keys": {"gemini": "load-test"},
+        "gemini": {
+            "requests_per_minute": args.requests_per_minute,
+            "burst": args.concurrency,
+            "backoff_base_seconds": 0.2,
+            "backoff_max_seconds": 2.0,
+        },
+        "admission": {"max_in_flight": args.max_in_flight, "session_requests_per_minute": 0},
+        "usage": {"log_path": ""},
+        "tts": {"default_backend": "silent", "languages": {}},
+    }
+    st.secrets = secrets
+
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("Runtime", (Runtime,), {})
+    app_test.LocalScriptRunner = _SessionScriptRunner
+    st.config.set_option("global.appTest", True)
+    # Worker threads outside a script run trigger harmless "missing ScriptRunContext" warnings
+    set_log_level("error")
+    warnings.filterwarnings("ignore", category=FutureWarning)
+
+    upstream = FakeGemini(
+        first_token=args.first_token,
+        output_tokens=args.output_tokens,
+        chunks=args.chunks,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+    )
+    gemini_api.set_model_factory(upstream)
+    register_backend("silent", SilentTTSBackend(delay=args.tts_delay))
+    return upstream
+
+
+class _SessionScriptRunner(LocalScriptRunner):
+    # AppTest gives every run the same session id and its own script cache; give each
+    # simulated user its own id and share compiled scripts, as a server would
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session_id = _current.session_id
+        self._script_cache = _script_cache
+
+
+class Session:
+    """One simulated user: an AppTest plus the rerun timings it collects."""
+
+    def __init__(self, script, timings, timeout):
+        self.at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+        self.timings = timings
+
+    def step(self, name, action):
+        start = time.perf_counter()
+        action()
+        self.timings[name].append(time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].value}")
+
+    def button(self, label=None, key=None):
+        for button in self.at.button:
+            if (key is not None and button.key == key) or (label is not None and button.label == label):
+                return button
+        # Usually the page rendered an error instead; surface it
+        errors = [element.value for element in self.at.error]
+        raise RuntimeError(f"button {key or label!r} not found" + (f": {errors[0]}" if errors else ""))
+
+
+def symphonic_session(index, args, timings):
+    session = Session("app.py", timings, args.timeout)
+    at = session.at
+    topic = APP_TOPICS[index % len(APP_TOPICS)]
+    query = f"{topic} {index % args.distinct_queries}"
+    session.step("app.load", at.run)
+    session.step("app.type_query", lambda: at.text_input[0].input(query).run())
+    session.step("app.generate", lambda: session.button("🎤 **Generate Response**").click().run())
+
+
+def veda_session(index, args, timings):
+    session = Session("veda.py", timings, args.timeout)
+    at = session.at
+    variant = index % args.distinct_queries
+    session.step("veda.load", at.run)
+    session.step("veda.enter", lambda: at.button[0].click().run())
+    session.step("veda.insights", lambda: session.button(key="insights").click().run())
+    question = f"{VEDA_QUESTIONS[index % len(VEDA_QUESTIONS)]} ({variant})"
+    session.step("veda.type_question", lambda: at.text_input[0].input(question).run())
+    session.step("veda.ask", lambda: session.button("Ask VedaGPT").click().run())
+    query = f"{HISTORY_QUERIES[index % len(HISTORY_QUERIES)]} {variant}"
+    session.step("veda.type_search", lambda: at.text_input[1].input(query).run())
+    session.step("veda.search", lambda: session.button("Search History").click().run())
+
+
+SCENARIOS = {"app": [symphonic_session], "veda": [veda_session], "both": [symphonic_session, veda_session]}
+
+
+def run(args):
+    upstream = prepare_environment(args)
+    scenarios = SCENARIOS[args.app]
+    timings = defaultdict(list)
+    timings_lock = threading.Lock()
+    failures = []
+
+    def run_session(index):
+        # Each session collects its own timings; they are merged once it ends
+        own = defaultdict(list)
+        _current.session_id = f"load-test-{index}"
+        try:
+            scenarios[index % len(scenarios)](index, args, own)
+        except Exception as e:
+            failures.append(f"session {index}: {e}")
+        with timings_lock:
+            for name, values in own.items():
+                timings[name].extend(values)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run_session, range(args.sessions)))
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "failed_sessions": len(failures),
+        "seconds": elapsed,
+        "sessions_per_second": args.sessions / elapsed,
+        "reruns_per_second": sum(len(values) for values in timings.values()) / elapsed,
+        "steps": {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+                "max": max(values),
+            }
+            for name, values in sorted(timings.items())
+        },
+        "upstream": upstream.stats(),
+        "cache": gemini_api.get_cache_stats(),
+        "coalescing": gemini_api.get_coalescing_stats(),
+        "admission": gemini_api.get_admission_stats(),
+        "peak_rss_mb": rss_mb(),
+        "peak_rss_growth_mb": rss_mb() - rss_before,
+    }
+    if args.trace_memory:
+        report["python_heap_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return report, failures
+
+
+def print_report(report, failures):
+    print(f"{report['sessions']} sessions, {report['concurrency']} concurrent, {report['seconds']:.1f} s: "
+          f"{report['sessions_per_second']:.2f} sessions/s, {report['reruns_per_second']:.1f} reruns/s, "
+          f"{report['failed_sessions']} failed")
+    print(f"\n{'step':<20} {'runs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, step in report["steps"].items():
+        print(f"{name:<20} {step['count']:>5} {step['p50'] * 1000:>8.0f} {step['p95'] * 1000:>8.0f} "
+              f"{step['p99'] * 1000:>8.0f} {step['max'] * 1000:>8.0f}")
+    print(f"\nfake upstream: {report['upstream']['calls']} calls, {report['upstream']['errors']} injected errors")
+    print(f"response cache: {report['cache']['hits']} hits, {report['cache']['misses']} misses")
+    for kind, stats in report["coalescing"].items():
+        print(f"coalescing {kind}: {stats['leaders']} upstream, {stats['followers']} joined")
+    admission = report["admission"]
+    print(f"admission: {admission['queued']} queued (mean wait {admission['mean_queue_wait_seconds']:.2f} s), "
+          f"{admission['rejected'] + admission['timeouts']} rejected")
+    print(f"memory: peak RSS {report['peak_rss_mb']:.0f} MB (+{report['peak_rss_growth_mb']:.0f} MB during the run)"
+          + (f", Python heap peak {report['python_heap_peak_mb']:.0f} MB" if "python_heap_peak_mb" in report else ""))
+    for failure in failures[:10]:
+        print(f"  {failure}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=sorted(SCENARIOS), default="both")
+    parser.add_argument("--sessions", type=int, default=40, help="simulated users in total")
+    parser.add_argument("--concurrency", type=int, default=8, help="users active at the same time")
+    parser.add_argument("--distinct-queries", type=int, default=1000,
+                        help="query variants; fewer than --sessions makes users repeat each other (cache hits)")
+    parser.add_argument("--first-token", default="lognormal:0.8,0.5",
+                        help='time to first token: "0.8", "uniform:0.3,1.5" or "lognormal:median,sigma"')
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="streaming rate after the first chunk")
+    parser.add_argument("--output-tokens", type=int, default=400)
+    parser.add_argument("--chunks", type=int, default=8, help="chunks per streamed answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream calls that fail (retried)")
+    parser.add_argument("--tts-delay", type=float, default=0.3, help="seconds per synthesized speech segment")
+    parser.add_argument("--requests-per-minute", type=float, default=6000,
+                        help="client-side Gemini rate limit ([gemini] requests_per_minute)")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="[admission] max_in_flight")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--trace-memory", action="store_true", help="also report the Python heap peak (slower)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--max-p95", type=float, help="exit with status 1 if any step's p95 exceeds this (seconds)")
+    args = parser.parse_args()
+
+    report, failures = run(args)
+    print_report(report, failures)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    slow = [name for name, step in report["steps"].items() if args.max_p95 and step["p95"] > args.max_p95]
+    if slow:
+        print(f"\np95 above {args.max_p95} s: {', '.join(slow)}")
+    if slow or failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
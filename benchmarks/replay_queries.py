@@ -0,0 +1,95 @@
+"""
+Replay a query log and compare response-cache hit rates for raw vs. canonical queries.
+
+Each query is looked up in a fresh ResponseCache of the app's size and inserted on a
+miss, once keyed by the text as typed and once by canonicalize_query(). The raw text is
+re-canonicalized with the current code, so changes to backend/normalize.py can be
+evaluated on old logs.
+
+Record a log by setting [query_log] path in .streamlit/secrets.toml. Without --log,
+a synthetic log of common spelling, case, punctuation and Unicode variants is used.
+
+Usage:
+    python benchmarks/replay_queries.py [--log .cache/queries.jsonl] [--max-entries 1024]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import unicodedata
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.cache import ResponseCache  # noqa: E402
+from backend.normalize import canonicalize_query  # noqa: E402
+
+BASE_QUERIES = [
+    ("symphonic", "love"), ("symphonic", "nature"), ("symphonic", "friendship"), ("symphonic", "monsoon rain"),
+    ("symphonic", "प्रेम"), ("symphonic", "हिन्दी कविता"), ("vedagpt", "what is karma?"),
+    ("vedagpt", "what is the significance of meditation in sanatan dharma?"), ("vedagpt", "धर्म क्या है?"),
+    ("history", "contributions of aryabhata"), ("history", "bhakti movement"), ("history", "१८५७ की क्रांति"),
+]
+
+
+def variants(text):
+    # Ways the same query is commonly typed
+    return [
+        text, text.capitalize(), text.upper(), f" {text} ", f"{text}!", f"{text}!!", f"{text}  ",
+        text.replace(" ", "  "), f"“{text}”", unicodedata.normalize("NFD", text), f"{text}।",
+    ]
+
+
+def synthetic_log(size, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(BASE_QUERIES))]  # Zipf-like popularity
+    log = []
+    for _ in range(size):
+        page, text = rng.choices(BASE_QUERIES, weights)[0]
+        log.append((page, rng.choice(variants(text))))
+    return log
+
+
+def read_log(path):
+    with open(path, encoding="utf-8") as f:
+        return [(record["page"], record["raw"]) for record in map(json.loads, f) if record.get("raw")]
+
+
+def replay(log, key, max_entries):
+    cache = ResponseCache(max_entries=max_entries, ttl=float("inf"))
+    for page, raw in log:
+        k = (page, key(raw))
+        if cache.get(k) is None:
+            cache.set(k, "response")
+    return cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="JSONL query log written by backend.normalize.log_query")
+    parser.add_argument("--synthetic-size", type=int, default=300)
+    parser.add_argument("--max-entries", type=int, default=1024)
+    args = parser.parse_args()
+
+    log = read_log(args.log) if args.log else synthetic_log(args.synthetic_size)
+    print(f"{len(log)} queries from {args.log or 'synthetic log'}")
+
+    raw_stats = replay(log, lambda raw: raw, args.max_entries)
+    canonical_stats = replay(log, canonicalize_query, args.max_entries)
+    print(f"{'key':<10} {'distinct':>9} {'hits':>7} {'misses':>7} {'hit rate':>9}")
+    for name, stats, keyer in (("raw", raw_stats, lambda raw: raw), ("canonical", canonical_stats, canonicalize_query)):
+        distinct = len({(page, keyer(raw)) for page, raw in log})
+        print(f"{name:<10} {distinct:>9} {stats['hits']:>7} {stats['misses']:>7} {stats['hit_rate']:>9.1%}")
+
+    # The canonical queries that absorbed the most distinct spellings
+    merged = defaultdict(set)
+    for page, raw in log:
+        merged[(page, canonicalize_query(raw))].add(raw)
+    print("\nmost merged:")
+    for (page, canonical), raws in sorted(merged.items(), key=lambda item: -len(item[1]))[:5]:
+        print(f"  {page}: {canonical!r} <- {len(raws)} spellings")
+
+
+if __name__ == "__main__":
+    main()
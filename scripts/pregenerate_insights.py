@@ -0,0 +1,91 @@
+"""
+Pre-generate VedBase insights for every (category, text, mandal, language).
+
+The requests are built with the same helper the app uses, sent through
+query_gemini_many with bounded concurrency, and stored in the versioned
+data/insights.json artifact. Entries whose request and model are unchanged are
+kept, so re-running only fills in what is missing or stale; the artifact is
+saved after every batch so an interrupted run keeps its progress. Failed items
+are reported and left out, and the app generates them live.
+
+Reads the Gemini API key from .streamlit/secrets.toml, so run it from the
+repository root:
+
+    python scripts/pregenerate_insights.py [--concurrency 4] [--languages en hi] [--force]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.gemini_api import DEFAULT_MODEL, query_gemini_many  # noqa: E402
+from backend.insights import (  # noqa: E402
+    INSIGHTS_PATH,
+    LANGUAGES,
+    InsightStore,
+    fingerprint,
+    insight_request,
+    iter_insight_subjects,
+    save_insights,
+)
+from backend.knowledge_base import KnowledgeBase  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4, help="requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=32, help="requests between artifact saves")
+    parser.add_argument("--languages", nargs="+", default=list(LANGUAGES), choices=list(LANGUAGES))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--output", default=INSIGHTS_PATH)
+    parser.add_argument("--force", action="store_true", help="regenerate entries that are already stored")
+    args = parser.parse_args()
+
+    knowledge_base = KnowledgeBase.load()
+    existing = {} if args.force else dict(InsightStore.load(args.output).entries())
+
+    # Keep only entries that the current knowledge base and prompt would still request
+    insights = {}
+    pending = []
+    for category, title, mandal, language in iter_insight_subjects(knowledge_base, args.languages):
+        request = insight_request(knowledge_base, category, title, mandal, language)
+        key = fingerprint(request, args.model)
+        if key in existing:
+            insights[key] = existing[key]
+            continue
+        subject = {"category": category, "title": title, "mandal": mandal, "language": language}
+        tags = {"page": "insights_batch", "mode": "mandal" if mandal else "text", "language": language}
+        pending.append((key, subject, dict(request, tags=tags)))
+    print(f"{len(insights)} insights up to date, {len(pending)} to generate with {args.model}")
+
+    failures = 0
+    start = time.perf_counter()
+    for offset in range(0, len(pending), args.batch_size):
+        batch = pending[offset:offset + args.batch_size]
+        results = query_gemini_many(
+            [request for _, _, request in batch],
+            max_concurrency=args.concurrency,
+            model_name=args.model,
+            use_cache=False,
+        )
+        for (key, subject, _), result in zip(batch, results):
+            if result.text:
+                insights[key] = dict(subject, text=result.text)
+            else:
+                failures += 1
+                print(f"  failed: {subject['category']} / {subject['title']} / {subject['mandal']} / "
+                      f"{subject['language']}: {result.error}")
+        save_insights(args.output, args.model, insights)
+        done = min(offset + args.batch_size, len(pending))
+        print(f"  {done}/{len(pending)} done ({time.perf_counter() - start:.1f} s)")
+
+    if not pending:
+        save_insights(args.output, args.model, insights)
+    print(f"wrote {len(insights)} insights to {args.output} ({failures} failed)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
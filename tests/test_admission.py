@@ -0,0 +1,162 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.admission import AdmissionController, AdmissionRejectedError
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_sessions_are_served_round_robin():
+    controller = AdmissionController(max_in_flight=1)
+    blocker = controller.acquire("X")
+    order = []
+
+    def request(session_id):
+        with controller.acquire(session_id):
+            order.append(session_id)
+            time.sleep(0.01)
+
+    threads = []
+    for session_id in ["A", "A", "A", "B", "B", "C"]:
+        thread = threading.Thread(target=request, args=(session_id,))
+        thread.start()
+        threads.append(thread)
+        queued = len(threads)
+        wait_until(lambda: controller.stats()["queued_now"] == queued)
+
+    blocker.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["A", "B", "C", "A", "B", "A"]
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_waiters_are_told_their_position():
+    controller = AdmissionController(max_in_flight=1)
+    blocker = controller.acquire("X")
+    positions = []
+    thread = threading.Thread(target=lambda: controller.acquire("A", on_wait=positions.append).release())
+    thread.start()
+    wait_until(lambda: positions == [1])
+    blocker.release()
+    thread.join()
+    assert positions == [1, 0]
+
+
+def test_session_quota_rejects_excess_requests():
+    controller = AdmissionController(max_in_flight=8, session_requests_per_minute=2)
+    controller.acquire("A").release()
+    controller.acquire("A").release()
+    with pytest.raises(AdmissionRejectedError):
+        controller.acquire("A")
+    # Other sessions have their own quota
+    controller.acquire("B").release()
+    assert controller.stats()["rejected"] == 1
+
+
+def test_queue_wait_times_out():
+    controller = AdmissionController(max_in_flight=1, max_wait=0.1)
+    blocker = controller.acquire("X")
+    with pytest.raises(AdmissionRejectedError):
+        controller.acquire("A")
+    stats = controller.stats()
+    assert (stats["timeouts"], stats["queued_now"]) == (1, 0)
+    blocker.release()
+    controller.acquire("A").release()
+
+
+def test_release_is_idempotent():
+    controller = AdmissionController(max_in_flight=1)
+    ticket = controller.acquire("A")
+    ticket.release()
+    ticket.release()
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_slot_is_returned_when_the_admission_callback_raises():
+    class Rerun(BaseException):
+        pass
+
+    def on_wait(position):
+        if position == 0:
+            raise Rerun()
+
+    controller = AdmissionController(max_in_flight=1)
+    blocker = controller.acquire("X")
+    errors = []
+
+    def request():
+        try:
+            controller.acquire("A", on_wait=on_wait)
+        except Rerun as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    wait_until(lambda: controller.stats()["queued_now"] == 1)
+    blocker.release()
+    thread.join()
+    assert len(errors) == 1
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_async_callers_above_the_limit_are_all_served():
+    controller = AdmissionController(max_in_flight=2, max_wait=5.0)
+    running = []
+    peak = []
+
+    async def request(session_id):
+        ticket = await controller.acquire_async(session_id)
+        try:
+            running.append(session_id)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+        finally:
+            running.remove(session_id)
+            ticket.release()
+
+    async def run_all():
+        await asyncio.gather(*(request(f"s{i % 3}") for i in range(9)))
+
+    start = time.monotonic()
+    asyncio.run(run_all())
+    assert time.monotonic() - start < 1.0
+    assert max(peak) == 2
+    stats = controller.stats()
+    assert (stats["admitted"], stats["in_flight"], stats["timeouts"]) == (9, 0, 0)
+
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    controller = AdmissionController(max_in_flight=1)
+
+    async def scenario():
+        blocker = controller.acquire("X")
+        waiting = asyncio.ensure_future(controller.acquire_async("A"))
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued_now"] == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        blocker.release()
+
+    asyncio.run(scenario())
+    stats = controller.stats()
+    assert (stats["queued_now"], stats["in_flight"]) == (0, 0)
+
+
+def test_async_queue_wait_times_out():
+    controller = AdmissionController(max_in_flight=1, max_wait=0.1)
+    blocker = controller.acquire("X")
+    with pytest.raises(AdmissionRejectedError):
+        asyncio.run(controller.acquire_async("A"))
+    assert controller.stats()["timeouts"] == 1
+    blocker.release()
+    assert controller.stats()["in_flight"] == 0
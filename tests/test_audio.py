@@ -0,0 +1,36 @@
+from backend.audio import SentenceSegmenter
+
+TEXT = " ".join(
+    f"Sentence number {i} talks about rivers, hills and the light of the early morning sky." for i in range(12)
+)
+
+
+def segment(chunks, min_chars=200):
+    segmenter = SentenceSegmenter(min_chars)
+    segments = []
+    for chunk in chunks:
+        segments += segmenter.feed(chunk)
+    return segments + segmenter.flush()
+
+
+def split(text, parts):
+    size = -(-len(text) // parts)
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_segments_do_not_depend_on_chunking():
+    whole = segment([TEXT])
+    assert "".join(whole) == TEXT
+    assert len(whole) > 2
+    for parts in (2, 3, 8, 50, len(TEXT)):
+        assert segment(split(TEXT, parts)) == whole
+
+
+def test_first_segment_is_the_first_sentence():
+    first = segment([TEXT])[0]
+    assert first.strip() == "Sentence number 0 talks about rivers, hills and the light of the early morning sky."
+
+
+def test_later_segments_reach_min_chars():
+    segments = segment([TEXT])
+    assert all(len(s.strip()) >= 200 for s in segments[1:-1])
@@ -0,0 +1,28 @@
+import time
+
+from backend.cache import ResponseCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = ResponseCache()
+    assert cache.get("k") is None
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_peek_does_not_count():
+    cache = ResponseCache()
+    assert cache.peek("k") is None
+    cache.set("k", "v")
+    assert cache.peek("k") == "v"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+
+
+def test_peek_ignores_expired_entries():
+    cache = ResponseCache(ttl=0.01)
+    cache.set("k", "v")
+    time.sleep(0.02)
+    assert cache.peek("k") is None
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+from google.api_core.exceptions import InvalidArgument, ServiceUnavailable
+
+from backend.resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy, TokenBucket
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    assert (breaker.opened, breaker.rejected) == (1, 1)
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.allow()  # the single probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.allow()
+
+
+def test_breaker_half_open_probe_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_stale_probe_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow() is True
+    time.sleep(0.06)
+    # The first probe never reported back; another is let through
+    assert breaker.allow() is True
+
+
+def test_cancelled_probe_does_not_wedge_the_breaker():
+    policy = ResiliencePolicy(requests_per_minute=6000, burst=10, failure_threshold=1, reset_timeout=0.05)
+    policy.breaker.record_failure()
+    time.sleep(0.06)
+
+    async def cancel_probe():
+        probe = asyncio.ensure_future(policy.call_async(asyncio.sleep, 10))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancel_probe())
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.stats()["circuit_state"] == "closed"
+
+
+def test_policy_retries_transient_errors():
+    policy = ResiliencePolicy(requests_per_minute=6000, burst=10, max_retries=2, backoff_base=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ServiceUnavailable("overloaded")
+        return "ok"
+
+    assert policy.call(flaky) == "ok"
+    stats = policy.stats()
+    assert (stats["retries"], stats["successes"], stats["circuit_state"]) == (2, 1, "closed")
+
+
+def test_policy_does_not_retry_bad_requests():
+    policy = ResiliencePolicy(requests_per_minute=6000, burst=10, failure_threshold=1)
+    attempts = []
+
+    def bad():
+        attempts.append(1)
+        raise InvalidArgument("bad prompt")
+
+    with pytest.raises(InvalidArgument):
+        policy.call(bad)
+    # A bad request is not an outage: no retries and the breaker stays closed
+    assert len(attempts) == 1
+    assert policy.stats()["circuit_state"] == "closed"
+
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate_per_minute=600, burst=2)
+    assert bucket.acquire(1) == 0 and bucket.acquire(1) == 0
+    assert bucket.acquire(1) > 0
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.singleflight import SingleFlight, StreamFlight
+
+
+def run_concurrently(fn, count):
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(fn) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "answer"
+
+    results = run_concurrently(lambda: flight.do("key", slow), 8)
+    assert results == ["answer"] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "followers": 7, "in_flight": 0}
+
+
+def test_errors_propagate_to_followers():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("upstream down")
+
+    results = run_concurrently(lambda: flight.do("key", failing), 4)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()["leaders"] == 1
+
+
+class Interrupted(BaseException):
+    """Stands in for Streamlit's StopException/RerunException."""
+
+
+def test_interrupted_leader_is_not_shared():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            time.sleep(0.2)
+            raise Interrupted()
+        return "answer"
+
+    def leader():
+        with pytest.raises(Interrupted):
+            flight.do("key", call)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait()
+    assert flight.do("key", call) == "answer"
+    leader_thread.join()
+    assert len(calls) == 2
+    assert flight.stats()["leaders"] == 2
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert [flight.do(key, lambda k=key: k) for key in "ab"] == ["a", "b"]
+    assert flight.stats()["leaders"] == 2
+
+
+def test_late_stream_joiners_get_every_chunk():
+    flight = StreamFlight()
+    produced = []
+    first_chunk = threading.Event()
+
+    def produce(count):
+        for i in range(count):
+            produced.append(i)
+            if i == 3:
+                first_chunk.set()
+            time.sleep(0.02)
+            yield i
+
+    results = {}
+
+    def read(name):
+        results[name] = list(flight.subscribe("key", produce, 10))
+
+    early = threading.Thread(target=read, args=("early",))
+    early.start()
+    first_chunk.wait()
+    late = threading.Thread(target=read, args=("late",))
+    late.start()
+    early.join()
+    late.join()
+    assert results == {"early": list(range(10)), "late": list(range(10))}
+    assert produced == list(range(10))
+    assert flight.stats() == {"leaders": 1, "followers": 1, "in_flight": 0}
+
+
+def test_stream_admission_ticket_is_released():
+    flight = StreamFlight()
+    released = threading.Event()
+
+    class Ticket:
+        def release(self):
+            released.set()
+
+    assert list(flight.subscribe("key", lambda: iter("abc"), admit=Ticket)) == ["a", "b", "c"]
+    assert released.wait(1)
@@ -0,0 +1,11 @@
+import pytest
+
+from backend.tts import EspeakBackend
+
+
+def test_missing_espeak_raises_a_clear_error(monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    backend = EspeakBackend()
+    assert not backend.supports("or")
+    with pytest.raises(RuntimeError, match="espeak-ng not found"):
+        backend.synthesize("namaskar", "or")